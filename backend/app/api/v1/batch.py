@@ -0,0 +1,206 @@
+# backend/app/api/v1/batch.py
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
+import io
+import logging
+
+from .schemas import (
+    AuthenticatedUser, BatchRequest, BatchJobStatus, BatchJobResults, BatchItemStatus, BatchItemResult
+)
+from .auth import get_current_user
+from .processing import sse_event, to_vehicle_rows
+from ...services.batch_service import BATCH_MAX_ITEMS, BatchItem, BatchJob, batch_queue
+from ...services.bulk_import_service import BulkImportError, read_vehicle_rows, write_output
+from ...services.pipeline import transmission_manual_from_option
+from ...scraping.executors import cpu_executor, render_executor
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+def _item_status(item: BatchItem) -> BatchItemStatus:
+    return BatchItemStatus(
+        index=item.index,
+        status=item.status,
+        site_status=item.site_status,
+        error=item.error,
+        elapsed=item.elapsed,
+    )
+
+
+def _item_outcome(item: BatchItem) -> dict:
+    """Vehículo del lote en el formato de resultados de bulk_import_service (para write_output)."""
+    transmission_option = {True: "Manual", False: "Automatic"}.get(item.transmission_manual, "Por defecto")
+    return {
+        "url1": item.url1,
+        "url2": item.url2,
+        "url3": item.url3,
+        "transmission_option": transmission_option,
+        "status": item.status,
+        "site_status": item.site_status,
+        "error": item.error,
+        "result": item.result,
+    }
+
+
+def _get_job(job_id: str, current_user: AuthenticatedUser) -> BatchJob:
+    job = batch_queue.get(job_id, str(current_user.id))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Lote no encontrado.")
+    return job
+
+
+@router.post("", response_model=BatchJobStatus, status_code=status.HTTP_202_ACCEPTED, tags=["Batch"])
+async def create_batch(
+    request_data: BatchRequest,
+    current_user: AuthenticatedUser = Depends(get_current_user)
+):
+    """
+    Encola un lote de vehículos (URLs + transmisión) y devuelve su ID.
+    Se procesan en segundo plano con concurrencia limitada; el progreso se consulta
+    en GET /batch/{job_id} o se sigue en GET /batch/{job_id}/events.
+    """
+    if len(request_data.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Un lote admite como máximo {BATCH_MAX_ITEMS} vehículos.")
+    items = [
+        {
+            "url1": item.url1,
+            "url2": item.url2,
+            "url3": item.url3,
+            "transmission_manual": transmission_manual_from_option(item.transmission_option),
+        }
+        for item in request_data.items
+    ]
+    job = batch_queue.submit(str(current_user.id), items)
+    logger.info(f"Lote {job.id} creado por el usuario {current_user.id} ({len(items)} vehículos)")
+    return BatchJobStatus(**job.summary())
+
+
+@router.post("/import", response_model=BatchJobStatus, status_code=status.HTTP_202_ACCEPTED, tags=["Batch"])
+async def import_batch(
+    file: UploadFile = File(...),
+    current_user: AuthenticatedUser = Depends(get_current_user)
+):
+    """
+    Encola un lote a partir de un CSV o XLSX con columnas url1, url2, url3 y
+    (opcional) transmission_option. Mismo seguimiento que POST /batch; el
+    resultado conjunto se descarga en GET /batch/{job_id}/export.
+    """
+    content = await file.read()
+    try:
+        rows = await cpu_executor.run(read_vehicle_rows, io.BytesIO(content), file.filename or "")
+    except BulkImportError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not rows:
+        raise HTTPException(status_code=400, detail="El fichero no contiene ninguna fila con URLs.")
+    if len(rows) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Un lote admite como máximo {BATCH_MAX_ITEMS} vehículos.")
+    items = [
+        {
+            "url1": row["url1"],
+            "url2": row["url2"],
+            "url3": row["url3"],
+            "transmission_manual": transmission_manual_from_option(row["transmission_option"]),
+        }
+        for row in rows
+    ]
+    job = batch_queue.submit(str(current_user.id), items)
+    logger.info(f"Lote {job.id} importado de '{file.filename}' por el usuario {current_user.id} ({len(items)} vehículos)")
+    return BatchJobStatus(**job.summary())
+
+
+@router.get("/{job_id}", response_model=BatchJobStatus, tags=["Batch"])
+async def get_batch_status(
+    job_id: str,
+    current_user: AuthenticatedUser = Depends(get_current_user)
+):
+    """Progreso del lote y estado de cada vehículo."""
+    job = _get_job(job_id, current_user)
+    return BatchJobStatus(**job.summary(), items=[_item_status(item) for item in job.items])
+
+
+@router.get("/{job_id}/results", response_model=BatchJobResults, tags=["Batch"])
+async def get_batch_results(
+    job_id: str,
+    current_user: AuthenticatedUser = Depends(get_current_user)
+):
+    """Resultados de los vehículos terminados (mismas filas que /process-vehicle) y errores de los fallidos."""
+    job = _get_job(job_id, current_user)
+    items = []
+    for item in job.items:
+        rows = None
+        if item.result is not None:
+            rows = to_vehicle_rows(item.result) if not item.result.empty else []
+        items.append(BatchItemResult(**_item_status(item).model_dump(), rows=rows))
+    return BatchJobResults(job_id=job.id, status=job.status, items=items)
+
+
+@router.get("/{job_id}/export", tags=["Batch"])
+async def export_batch(
+    job_id: str,
+    format: str = Query("xlsx", pattern="^(xlsx|csv)$"),
+    current_user: AuthenticatedUser = Depends(get_current_user)
+):
+    """
+    Descarga los 'Valor Final' de todo el lote en un único fichero: una fila por
+    clave y una columna por vehículo (los no terminados salen con "-").
+    En xlsx se añade una hoja con el estado de cada vehículo.
+    """
+    job = _get_job(job_id, current_user)
+    content = await render_executor.run(write_output, [_item_outcome(item) for item in job.items], format)
+    media_type = (
+        "text/csv; charset=utf-8" if format == "csv"
+        else "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+    return Response(
+        content=content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="lote_{job.id}.{format}"'},
+    )
+
+
+@router.get("/{job_id}/events", tags=["Batch"])
+async def stream_batch_events(
+    job_id: str,
+    current_user: AuthenticatedUser = Depends(get_current_user)
+):
+    """
+    Progreso del lote con Server-Sent Events.
+
+    Eventos: status (resumen al conectar), item (cada vehículo que termina)
+    y done (resumen final, después se cierra el stream).
+    """
+    job = _get_job(job_id, current_user)
+
+    async def events():
+        queue = job.subscribe()
+        try:
+            yield sse_event("status", job.summary())
+            if job.finished:
+                yield sse_event("done", job.summary())
+                return
+            while True:
+                index = await queue.get()
+                if index is None:
+                    yield sse_event("done", job.summary())
+                    return
+                yield sse_event("item", _item_status(job.items[index]).model_dump())
+        finally:
+            job.unsubscribe(queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.delete("/{job_id}", response_model=BatchJobStatus, tags=["Batch"])
+async def cancel_batch(
+    job_id: str,
+    current_user: AuthenticatedUser = Depends(get_current_user)
+):
+    """Cancela los vehículos del lote que aún no han empezado."""
+    job = _get_job(job_id, current_user)
+    batch_queue.cancel(job)
+    return BatchJobStatus(**job.summary(), items=[_item_status(item) for item in job.items])
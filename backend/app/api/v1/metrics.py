@@ -0,0 +1,48 @@
+# backend/app/api/v1/metrics.py
+from fastapi import APIRouter, Depends
+from typing import Any, Dict
+
+from .schemas import AuthenticatedUser
+from .auth import get_current_user
+from ...services.scraping_service import (
+    get_connection_stats, get_cache_stats, get_cpu_pool_stats, get_rate_limit_stats, get_resilience_stats
+)
+from ...services.batch_service import batch_queue
+from ...scraping.executors import get_executor_stats
+
+router = APIRouter()
+
+
+@router.get("/scraping", tags=["Metrics"])
+async def scraping_metrics(
+    current_user: AuthenticatedUser = Depends(get_current_user)
+) -> Dict[str, Any]:
+    """
+    Métricas del scraping: reutilización de conexiones, cachés y
+    tiempo de espera en el limitador por host (para dimensionar sus límites)
+    estado del circuit breaker de cada sitio, ocupación de la cola de lotes
+    y del pool de procesos de parseo/transformación.
+    """
+    return {
+        "connections": get_connection_stats(),
+        "caches": get_cache_stats(),
+        "rate_limits": get_rate_limit_stats(),
+        "resilience": get_resilience_stats(),
+        "batch_queue": batch_queue.stats(),
+        "cpu_pool": get_cpu_pool_stats(),
+    }
+
+
+@router.get("/executors", tags=["Metrics"])
+async def executor_metrics(
+    current_user: AuthenticatedUser = Depends(get_current_user)
+) -> Dict[str, Any]:
+    """
+    Ocupación de los executors de cada etapa (fetch: caché HTML en disco; cpu: parseo,
+    transformación y fusión; render: documentos) y del pool de procesos, si está activo.
+    Por etapa: hilos, tareas activas y en cola, espera media/máxima y utilización.
+    """
+    return {
+        "executors": get_executor_stats(),
+        "cpu_pool": get_cpu_pool_stats(),
+    }
@@ -1,7 +1,11 @@
 # backend/app/api/v1/processing.py
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from typing import Any, Dict, List
+import json
+import pandas as pd
 import logging
+from decouple import config
 
 
 # Importamos los modelos y la dependencia de autenticación
@@ -9,8 +13,11 @@ from .schemas import ScrapingRequest, VehicleRow, AuthenticatedUser # <-- Authen
 from .auth import get_current_user # <-- Importamos la dependencia
 
 # Importamos los servicios necesarios
-from ...services.scraping_service import process_all_urls
-from ...services.transform_service import apply_transformations, merge_and_prioritize
+from ...services.scraping_service import SiteResult
+from ...services.pipeline import (
+    iter_process_sites, merge_site_results, process_sites, transmission_manual_from_option
+)
+from ...scraping.executors import cpu_executor
 from app.data_transformation.key_map import FINAL_KEY_MAP 
 
 
@@ -18,9 +25,19 @@ from app.data_transformation.key_map import FINAL_KEY_MAP
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Plazo total (segundos) para el scraping de /process-vehicle. Al vencer se responde
+# con los sitios que hayan terminado; el estado de cada uno va en la cabecera X-Site-Status.
+PROCESS_VEHICLE_DEADLINE = config("PROCESS_VEHICLE_DEADLINE", default=20.0, cast=float)
+
+
+def format_site_status(results: Dict[str, SiteResult]) -> str:
+    """Estado por sitio para la cabecera X-Site-Status, p. ej. "site1=ok, site2=timeout"."""
+    return ", ".join(f"{site}={result.status}" for site, result in results.items())
+
 @router.post("/process-vehicle", response_model=List[VehicleRow], tags=["Processing"])
 async def process_vehicle_data(
     request_data: ScrapingRequest,
+    response: Response,
     # AÑADIMOS LA DEPENDENCIA DE AUTENTICACIÓN:
     current_user: AuthenticatedUser = Depends(get_current_user)
 ):
@@ -36,34 +53,105 @@ async def process_vehicle_data(
 )
 
     # Mapea la opción de transmisión
-    transmission_manual = None
-    if request_data.transmission_option == "Manual":
-        transmission_manual = True
-    elif request_data.transmission_option == "Automatic":
-        transmission_manual = False
-
-    # 1. Scraping
-    scraped_dfs = await process_all_urls(
+    transmission_manual = transmission_manual_from_option(request_data.transmission_option)
+
+    # 1 y 2. Scraping + transformación, en un pipeline por sitio: cada sitio se
+    # transforma en cuanto termina su scraping, en paralelo con los demás.
+    # Con plazo total: no se espera a un sitio colgado.
+    site_results = await process_sites(
         request_data.url1,
         request_data.url2,
         request_data.url3,
-        transmission_manual
+        transmission_manual,
+        deadline=PROCESS_VEHICLE_DEADLINE,
     )
+    scraped_dfs = {site: result.df for site, result in site_results.items()}
+    site_status = format_site_status(site_results)
+    response.headers["X-Site-Status"] = site_status
 
     if not any(df is not None for df in scraped_dfs.values()):
-        raise HTTPException(status_code=400, detail="No se pudo obtener datos de ninguna URL proporcionada.")
-
-    # 2. Transformación
-    transformed_dfs = apply_transformations(scraped_dfs)
+        raise HTTPException(
+            status_code=400,
+            detail="No se pudo obtener datos de ninguna URL proporcionada.",
+            headers={"X-Site-Status": site_status},
+        )
 
     # 3. Fusión y Priorización
-    final_df = merge_and_prioritize(transformed_dfs)
+    final_df = await cpu_executor.run(merge_site_results, site_results)
 
     if final_df.empty:
         # Podrías devolver una lista vacía si es un resultado válido en algunos casos
         # raise HTTPException(status_code=500, detail="No se pudieron procesar los datos después de la fusión.")
         return []
 
+    try:
+        return to_vehicle_rows(final_df)
+    except Exception as e:
+        logger.error(f"Error al validar el modelo de respuesta: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Error al formatear los datos de respuesta.")
+
+
+@router.post("/process-vehicle/stream", tags=["Processing"])
+async def process_vehicle_data_stream(
+    request_data: ScrapingRequest,
+    current_user: AuthenticatedUser = Depends(get_current_user)
+):
+    """
+    Variante de /process-vehicle que envía resultados parciales con Server-Sent Events.
+
+    Eventos (data en JSON):
+      - site: {"site", "status", "error", "rows": [{"Key", "Value"}]} en cuanto un sitio
+        termina su scraping y su transformación (cada sitio en su propio pipeline).
+      - result: filas finales tras merge_and_prioritize (mismo formato que /process-vehicle).
+      - error: {"detail"} si no se pudo obtener datos de ninguna URL.
+    SOLO PARA USUARIOS AUTENTICADOS.
+    """
+    logger.info(f"Petición de /process-vehicle/stream por usuario autenticado: ID={current_user.id}")
+    transmission_manual = transmission_manual_from_option(request_data.transmission_option)
+
+    async def events():
+        site_results: Dict[str, SiteResult] = {}
+        async for site, result in iter_process_sites(
+            request_data.url1,
+            request_data.url2,
+            request_data.url3,
+            transmission_manual,
+            deadline=PROCESS_VEHICLE_DEADLINE,
+        ):
+            rows = []
+            site_results[site] = result
+            df = result.transformed
+            if df is not None:
+                rows = df[['Key', 'Value']].where(df[['Key', 'Value']].notna(), None).to_dict('records')
+            yield sse_event("site", {"site": site, "status": result.status, "error": result.error, "rows": rows})
+
+        if not any(result.df is not None for result in site_results.values()):
+            yield sse_event("error", {"detail": "No se pudo obtener datos de ninguna URL proporcionada."})
+            return
+
+        try:
+            final_df = await cpu_executor.run(merge_site_results, site_results)
+            rows = to_vehicle_rows(final_df) if not final_df.empty else []
+        except Exception as e:
+            logger.error(f"Error al fusionar los datos: {e}", exc_info=True)
+            yield sse_event("error", {"detail": "Error al formatear los datos de respuesta."})
+            return
+        yield sse_event("result", [row.model_dump(by_alias=True) for row in rows])
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def sse_event(event: str, data: Any) -> str:
+    """Formatea un evento de Server-Sent Events."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+def to_vehicle_rows(final_df: pd.DataFrame) -> List[VehicleRow]:
+    """Convierte el DataFrame fusionado en la lista de VehicleRow de la respuesta."""
     if 'Key' in final_df.columns:
         final_df = final_df.rename(columns={'Key': 'key'})    
 
@@ -82,15 +170,9 @@ async def process_vehicle_data(
     # Convertimos el DataFrame a una lista de diccionarios.
     # Pydantic usará los alias definidos en VehicleRow para encontrar las columnas correctas.
     results_raw = final_df.where(final_df.notna(), None).to_dict('records')
-    
-    try:
-        # Pydantic valida los datos y crea los objetos de respuesta
-        validated_results = [VehicleRow.model_validate(row) for row in results_raw]
-    except Exception as e:
-        logger.error(f"Error al validar el modelo de respuesta: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Error al formatear los datos de respuesta.")
 
-    return validated_results
+    # Pydantic valida los datos y crea los objetos de respuesta
+    return [VehicleRow.model_validate(row) for row in results_raw]
 
 
 
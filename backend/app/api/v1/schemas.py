@@ -79,4 +79,37 @@ class UserProfileResponse(BaseModel):
 
 class StatusUpdateRequest(BaseModel):
     """Define el cuerpo esperado para la solicitud de cambio de estado."""
-    status: str = Field(..., pattern="^(Ok|Under review)$") # Valida que solo se acepten estos dos valores
\ No newline at end of file
+    status: str = Field(..., pattern="^(Ok|Under review)$") # Valida que solo se acepten estos dos valores
+
+# --- Modelos para procesamiento por lotes ---
+class BatchRequest(BaseModel):
+    """Lote de vehículos: cada elemento es como el cuerpo de /process-vehicle."""
+    items: List[ScrapingRequest] = Field(..., min_length=1)
+
+class BatchItemStatus(BaseModel):
+    index: int
+    status: str  # pending, running, done, failed, cancelled
+    site_status: Dict[str, str] = Field(default_factory=dict)
+    error: Optional[str] = None
+    elapsed: Optional[float] = None
+
+class BatchItemResult(BatchItemStatus):
+    rows: Optional[List[VehicleRow]] = None
+
+class BatchJobStatus(BaseModel):
+    job_id: str
+    status: str  # queued, running, finished, cancelled
+    total: int
+    pending: int
+    running: int
+    done: int
+    failed: int
+    cancelled: int
+    created_at: float
+    finished_at: Optional[float] = None
+    items: List[BatchItemStatus] = Field(default_factory=list)
+
+class BatchJobResults(BaseModel):
+    job_id: str
+    status: str
+    items: List[BatchItemResult]
@@ -0,0 +1,67 @@
+# backend/app/bulk_import.py
+"""
+Importación masiva sin servidor: procesa un CSV/XLSX de vehículos y escribe los
+'Valor Final' de todos en un único fichero.
+
+    python -m app.bulk_import vehiculos.xlsx -o resultados.xlsx
+    python -m app.bulk_import vehiculos.csv -o resultados.csv --workers 4 --deadline 90
+
+Columnas de entrada: url1, url2, url3 (al menos una) y transmission_option
+(Manual, Automatic o Por defecto; opcional). Los vehículos se reparten entre
+--workers procesos; el formato de salida se deduce de la extensión (.xlsx o .csv).
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+from .services.bulk_import_service import (
+    BULK_IMPORT_DEADLINE, BULK_IMPORT_WORKERS, OUTPUT_FORMATS, BulkImportError,
+    read_vehicle_rows, run_bulk_import, write_output,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="Fichero .csv o .xlsx con las URLs")
+    parser.add_argument("-o", "--output", required=True, help="Fichero de salida (.xlsx o .csv)")
+    parser.add_argument("--workers", type=int, default=BULK_IMPORT_WORKERS, help="Procesos en paralelo")
+    parser.add_argument("--deadline", type=float, default=BULK_IMPORT_DEADLINE, help="Segundos por vehículo")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s")
+
+    fmt = os.path.splitext(args.output)[1].lower().lstrip(".")
+    if fmt not in OUTPUT_FORMATS:
+        parser.error(f"Formato de salida no soportado: '{fmt}'. Use .xlsx o .csv.")
+
+    try:
+        rows = read_vehicle_rows(args.input, args.input)
+    except BulkImportError as e:
+        sys.exit(str(e))
+    if not rows:
+        sys.exit("El fichero no contiene ninguna fila con URLs.")
+
+    print(f"{len(rows)} vehículos, {args.workers} procesos")
+    start = time.monotonic()
+    finished = 0
+
+    def on_progress(index, outcome):
+        nonlocal finished
+        finished += 1
+        sites = ", ".join(f"{site}={status}" for site, status in outcome["site_status"].items())
+        detail = outcome["error"] if outcome["error"] else sites
+        print(f"[{finished}/{len(rows)}] vehículo {index + 1}: {outcome['status']} ({detail})")
+
+    outcomes = run_bulk_import(rows, workers=args.workers, deadline=args.deadline, on_progress=on_progress)
+
+    with open(args.output, "wb") as f:
+        f.write(write_output(outcomes, fmt))
+
+    done = sum(1 for outcome in outcomes if outcome["status"] == "done")
+    print(f"{done}/{len(outcomes)} vehículos con datos en {time.monotonic() - start:.1f} s -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
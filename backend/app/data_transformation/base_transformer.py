@@ -0,0 +1,141 @@
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional
+from dataclasses import dataclass
+from .vehicle_record import VehicleRecord
+
+
+@dataclass
+class VehicleDataConfig:
+    """Configuración para la transformación de datos del vehículo."""
+    column_mapping: Dict[str, str]
+    ordered_keys: List[str]
+
+
+class BaseVehicleDataTransformer:
+    """Pasos comunes a los transformadores de todos los sitios.
+
+    Cada transformador define _apply_steps, sus pasos sobre el VehicleRecord de un
+    vehículo; la base construye el registro (_rename_columns), completa las claves
+    (_add_missing_keys) y ordena el resultado, para uno (transform) o varios
+    vehículos a la vez (transform_batch).
+    """
+
+    def __init__(self, config: VehicleDataConfig):
+        self.config = config
+        self._key_codes: Optional[Dict[str, int]] = None
+
+    def transform(self, df_input: pd.DataFrame) -> pd.DataFrame:
+        """Método principal que orquesta la transformación de datos de un vehículo."""
+        record = self._transform_record(df_input["Key"].tolist(), self._prepare_values(df_input["Value"]))
+        return self._sort_and_clean(record.to_frame())
+
+    def transform_batch(
+        self,
+        df_input: pd.DataFrame,
+        id_column: str = "vehicle_id",
+        errors: Optional[Dict[Any, Exception]] = None,
+    ) -> pd.DataFrame:
+        """Transforma varios vehículos en una sola llamada.
+
+        df_input es una tabla larga con las filas (Key, Value) de todos los vehículos y una
+        columna id_column con el vehículo de cada fila (las filas sin id se ignoran).
+        Devuelve una tabla larga (id_column, Key, Value) con, por cada vehículo y en el orden
+        en que aparece por primera vez, las mismas filas y en el mismo orden que transform().
+
+        Las operaciones de pandas (preparar los valores, construir la tabla y categorizar las
+        claves) se hacen una vez para todo el lote; por vehículo solo quedan sus pasos sobre
+        el VehicleRecord y ordenar sus claves.
+
+        Si un vehículo falla, la excepción se propaga; si se pasa el dict errors, se guarda
+        ahí con su id y el vehículo se omite del resultado.
+        """
+        ids = df_input[id_column]
+        valid = ids.notna().to_numpy()
+        ids = ids.tolist()
+        keys = df_input["Key"].tolist()
+        values = self._prepare_values(df_input["Value"])
+
+        vehicles: Dict[Any, tuple] = {}
+        for vehicle_id, key, value, is_valid in zip(ids, keys, values, valid):
+            if is_valid:
+                vehicle = vehicles.get(vehicle_id)
+                if vehicle is None:
+                    vehicle = vehicles[vehicle_id] = ([], [])
+                vehicle[0].append(key)
+                vehicle[1].append(value)
+
+        codes_dtype = pd.Categorical([], categories=self.config.ordered_keys).codes.dtype
+        out_ids: List[Any] = []
+        out_codes: List[np.ndarray] = []
+        out_values: List[Any] = []
+        for vehicle_id, (vehicle_keys, vehicle_values) in vehicles.items():
+            try:
+                record = self._transform_record(vehicle_keys, vehicle_values)
+            except Exception as e:
+                if errors is None:
+                    raise
+                errors[vehicle_id] = e
+                continue
+            record_keys, record_values = record.columns()
+            codes, positions = self._sorted_codes(record_keys, codes_dtype)
+            out_ids.extend([vehicle_id] * len(positions))
+            out_codes.append(codes)
+            out_values.extend(record_values[i] for i in positions)
+
+        codes = np.concatenate(out_codes) if out_codes else np.array([], dtype=codes_dtype)
+        return pd.DataFrame({
+            id_column: out_ids,
+            "Key": pd.Categorical.from_codes(codes, categories=self.config.ordered_keys, ordered=True),
+            "Value": out_values,
+        })
+
+    def _transform_record(self, keys: List[Any], values: List[Any]) -> VehicleRecord:
+        record = self._rename_columns(keys, values)
+        self._apply_steps(record)
+        self._add_missing_keys(record)
+        return record
+
+    def _apply_steps(self, record: VehicleRecord) -> None:
+        """Pasos de transformación propios del sitio, en orden."""
+        raise NotImplementedError
+
+    def _prepare_values(self, values: pd.Series) -> List[Any]:
+        """Valores de entrada en el orden de las filas. Los sitios que limpian los valores
+        antes de los pasos lo hacen aquí, sobre toda la columna (en lote, la de todos los vehículos)."""
+        return values.tolist()
+
+    def _rename_columns(self, keys: List[Any], values: List[Any]) -> VehicleRecord:
+        """Crea el registro con las claves renombradas según el mapeo configurado.
+
+        El mapeo se consulta directamente en el dict; las claves que no están en él se conservan.
+        """
+        mapping = self.config.column_mapping
+        return VehicleRecord((mapping.get(key, key), value) for key, value in zip(keys, values))
+
+    def _add_missing_keys(self, record: VehicleRecord) -> None:
+        """Añade información sobre claves faltantes, asegurando que se incluyan todas las ordered_keys."""
+        present = set(record.keys())
+        for key in self.config.ordered_keys:
+            if key not in present:
+                record.append(key, "None")
+
+    def _sort_and_clean(self, df: pd.DataFrame) -> pd.DataFrame:
+        df["Key"] = pd.Categorical(df["Key"], categories=self.config.ordered_keys, ordered=True)
+        return df.dropna(subset=['Key']).sort_values("Key").reset_index(drop=True)
+
+    def _sorted_codes(self, keys: List[Any], codes_dtype: np.dtype):
+        """Equivalente a _sort_and_clean sobre las claves de un vehículo: devuelve los códigos
+        de categoría ya ordenados y la posición original de cada fila que se conserva.
+
+        Usa el mismo argsort (quicksort sobre los códigos, del mismo tipo) que sort_values,
+        así que las claves repetidas quedan en el mismo orden que con transform().
+        """
+        if self._key_codes is None:
+            self._key_codes = {key: code for code, key in enumerate(self.config.ordered_keys)}
+        key_codes = self._key_codes
+        codes = np.fromiter((key_codes.get(key, -1) for key in keys), dtype=codes_dtype, count=len(keys))
+        kept = codes >= 0
+        codes = codes[kept]
+        order = codes.argsort(kind="quicksort")
+        return codes[order], np.flatnonzero(kept)[order]
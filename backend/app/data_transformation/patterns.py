@@ -0,0 +1,55 @@
+# backend/app/data_transformation/patterns.py
+
+"""
+Expresiones regulares de los transformadores, compiladas una sola vez al importar el módulo.
+
+Los pasos de transformación se ejecutan por cada vehículo: usar estos objetos evita
+la búsqueda en la caché interna de `re` (o la compilación, si el patrón se construye
+en la llamada) cada vez que se procesa un valor.
+"""
+
+import re
+
+
+# --- Sitio 1 ---
+
+# Texto entre paréntesis, p. ej. "(55 pk)" en los remarks eléctricos
+PARENTHESIS_TEXT = re.compile(r"\(.*?\)")
+
+# Consumo NEDC: número antes de "liter" ("5,6 liter/100km")
+NEDC_FUEL_LITER = re.compile(r'([\d,]+)\s*liter')
+
+# Consumo WLTP: número antes de "liter" o "g/km"
+WLTP_FUEL_VALUE = re.compile(r'([\d.,]+)\s*(liter|g/km)')
+
+# Medidas en centímetros ("270 cm"), que se pasan a milímetros
+CM_VALUE = re.compile(r'(\d+)(?:\.?\d*)\s*cm')
+
+# Unidades cuyos puntos son separadores de miles ("1.500 kg") y que se quitan del valor.
+# El orden importa: se eliminan una tras otra.
+VALUE_UNITS = ('kg', 'cm³', 'dB(A)', 'Wh/km')
+
+
+# --- Sitio 2 ---
+
+# Código de transmisión (primer segmento de "18 Transmission/IA", en minúsculas)
+TRANSMISSION_DUAL_CLUTCH = re.compile(r'^m(\d+)a$')   # m8a
+TRANSMISSION_AUTOMATIC = re.compile(r'^a(\d+)$')      # a8
+TRANSMISSION_MANUAL = re.compile(r'^m(\d+)$')         # m6
+
+# Velocidad máxima por tipo de caja en "19 Vehicle VMax" ("mech 190 - autom 188")
+VMAX_MECH = re.compile(r'mech\s*(\d+)', re.IGNORECASE)
+VMAX_AUTOM = re.compile(r'autom\s*(\d+)', re.IGNORECASE)
+
+# Marcas de homologación del enganche (Remark 56): desde cada clave hasta 3 espacios o fin de línea.
+# Se conservan en este orden porque los resultados se devuelven agrupados por clave.
+MARK_KEYWORDS = tuple(
+    re.compile(rf'{re.escape(clave)}\s*[:\-]?\s*(.+?)(?=\s{{3,}}|$)', flags=re.IGNORECASE)
+    for clave in ('Konformitätszeichen', 'Genehmigungszeichen', 'Genehmigungsnummer')
+)
+# Sin clave: empieza por e/E + dígitos, hasta 3 espacios o fin de línea
+MARK_GLOBAL = re.compile(r'\b[eE]\d+.*?(?=\s{3,}|$)')
+
+# Claves de emisiones: prefijo "72 Emissions - " y sufijo entre paréntesis ("(mec)", "(autom)")
+EMISSIONS_PREFIX = re.compile(r'72 Emissions -\s*')
+PARENTHESIS_SUFFIX = re.compile(r'\s*\(.*\)')
@@ -1,82 +1,68 @@
 import pandas as pd
-from typing import Dict, List, Optional
-from dataclasses import dataclass
-import re
+from typing import Any, List, Optional
+from functools import lru_cache
 from .master_keys import MASTER_ORDERED_KEYS
+from .base_transformer import BaseVehicleDataTransformer, VehicleDataConfig
+from .vehicle_record import VehicleRecord
+from . import patterns
 
 
-@dataclass
-class VehicleDataConfig:
-    """Configuración para la transformación de datos del vehículo."""
-    column_mapping: Dict[str, str]
-    ordered_keys: List[str]
+@lru_cache(maxsize=256)
+def _emission_key(key: str, suffix: Optional[str]) -> str:
+    """"72 Emissions - CO (mec)" -> "Emissions CO".
 
-class VehicleDataTransformer_site2:
+    Sin suffix se quita cualquier sufijo entre paréntesis; con suffix, solo ese.
+    Las claves se repiten de un vehículo a otro, así que cada una se limpia una sola vez.
+    """
+    emission_type = patterns.EMISSIONS_PREFIX.sub('', key)
+    if suffix is None:
+        emission_type = patterns.PARENTHESIS_SUFFIX.sub('', emission_type)
+    else:
+        emission_type = emission_type.replace(suffix, "").strip()
+    return f"Emissions {emission_type}"
+
+
+class VehicleDataTransformer_site2(BaseVehicleDataTransformer):
     """Clase para transformar datos de vehículos."""
 
-    def __init__(self, config: VehicleDataConfig):
-        self.config = config
-
-    def transform(self, df_input: pd.DataFrame) -> pd.DataFrame:
-        """Método principal que orquesta la transformación de datos."""
-        df = df_input.copy()
-        df = self._rename_columns(df)
-
-        df = self._add_powered_axles(df)
-        df = self._process_dimensions(df)
-        df = self._add_axle_track(df)
-        df = self._add_rear_overhang(df)
-        df = self._process_axles_distribution_maxmass(df)
-        df = self._add_max_trailer_mass(df)
-        df = self._add_max_coupling_load(df)
-        df = self._process_engines(df)
-        df = self._add_working_principle(df)
-        df = self._add_direct_injection(df)
-        df = self._add_electric_vehicle(df)
-        df = self._add_hybrid_electric_vehicle(df)
-        df = self._add_cylinders(df)
-        df = self._add_max_power(df)
-        df = self._process_transmission(df)
-        df = self._add_final_drive_ratio(df)
-        df = self._add_max_speed(df)
-        df = self._add_coupling_approval(df)
-        df = self._aux_emissions(df)
-        df = self._process_emissions_values(df)
-
-
-
-        df = self._add_missing_keys(df)
-        df = self._sort_and_clean(df)
-        return df
-
-    def _rename_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _apply_steps(self, record: VehicleRecord) -> None:
+        """Pasos de transformación del sitio 2, en orden.
+
+        Trabajan sobre un VehicleRecord (acceso por clave sin recorrer filas, sin pd.concat
+        por fila) con las claves ya renombradas.
+        """
+        self._add_powered_axles(record)
+        self._process_dimensions(record)
+        self._add_axle_track(record)
+        self._add_rear_overhang(record)
+        self._process_axles_distribution_maxmass(record)
+        self._add_max_trailer_mass(record)
+        self._add_max_coupling_load(record)
+        self._process_engines(record)
+        self._add_working_principle(record)
+        self._add_direct_injection(record)
+        self._add_electric_vehicle(record)
+        self._add_hybrid_electric_vehicle(record)
+        self._add_cylinders(record)
+        self._add_max_power(record)
+        self._process_transmission(record)
+        self._add_final_drive_ratio(record)
+        self._add_max_speed(record)
+        self._add_coupling_approval(record)
+        self._aux_emissions(record)
+        self._process_emissions_values(record)
+
+    def _rename_columns(self, keys: List[Any], values: List[Any]) -> VehicleRecord:
         """Renombra las columnas según el mapeo configurado y asegura que todas las claves estén presentes."""
-        # Renombrar las columnas según el mapeo
-        df["Key"] = df["Key"].map(lambda x: self.config.column_mapping.get(x, x))
+        record = super()._rename_columns(keys, values)
 
         # Verificar claves faltantes y agregar filas con "None"
-        missing_keys = [
-            self.config.column_mapping[key]
-            for key in self.config.column_mapping.keys()
-            if self.config.column_mapping[key] not in df["Key"].values
-        ]
+        for key in self.config.column_mapping.values():
+            if key not in record:
+                record.append(key, "None")
 
-        if missing_keys:
-            missing_rows = [{"Key": key, "Value": "None"} for key in missing_keys]
-            df = pd.concat([df, pd.DataFrame(missing_rows)], ignore_index=True)
+        return record
 
-        return df
-
-
-    def _add_missing_keys(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Añade información sobre claves faltantes, asegurando que se incluyan todas las ordered_keys."""
-        missing_rows = [
-            {"Key": key, "Value": "None"}
-            for key in self.config.ordered_keys if key not in df["Key"].values
-        ]
-        if missing_rows:
-            df = pd.concat([df, pd.DataFrame(missing_rows)], ignore_index=True)
-        return df
 
 
 
@@ -84,17 +70,15 @@ class VehicleDataTransformer_site2:
 
 #   "Powered axles": "powered_axles",                               # B2
 
-    def _add_powered_axles(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _add_powered_axles(self, record: VehicleRecord) -> None:
         """Añade información sobre ejes motorizados."""
-        if "powered_axles" in df["Key"].values:
-          actual_value = df[df["Key"] == "powered_axles"]["Value"].values[0]
+        if "powered_axles" in record:
+          actual_value = record.first("powered_axles")
 
           if actual_value == "All-wheel drive":
-            df.loc[df["Key"] == "powered_axles", "Value"] = "2"
+            record.set("powered_axles", "2")
           else:
-            df.loc[df["Key"] == "powered_axles", "Value"] = "1"
-
-        return df
+            record.set("powered_axles", "1")
 
 
  #   "Length": "length",                                             # B5
@@ -108,7 +92,7 @@ class VehicleDataTransformer_site2:
  #   "remarks_11": "remarks_11",                                     # A19
  #   "remarks_12": "remarks_12",                                     # A27
 
-    def _process_dimensions(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _process_dimensions(self, record: VehicleRecord) -> None:
         """Procesa las dimensiones y extrae el primer número en caso de rango.
         El segundo número, si existe, se guarda como un 'remark' correspondiente.
         Si no existe, se guarda 'None' en el remark.
@@ -123,47 +107,39 @@ class VehicleDataTransformer_site2:
         }
 
         for key, remark_key in key_remark_map.items():
-            mask = df["Key"] == key
-            values = df.loc[mask, "Value"].astype(str)
+            second_values = []
 
-            for idx, val in values.items():
-                parts = [p.strip() for p in val.split("-")]
-
-                # Tomar primer número
-                first_val = parts[0] if len(parts) > 0 else None
-                df.at[idx, "Value"] = first_val
+            def first_number(val):
+                parts = [p.strip() for p in str(val).split("-")]
 
                 # Tomar segundo número si existe, si no asignar None
-                second_val = parts[1] if len(parts) > 1 else None
+                second_values.append(parts[1] if len(parts) > 1 else None)
+
+                # Tomar primer número
+                return parts[0]
 
-                # Agregar fila para remark
-                new_row = pd.DataFrame({
-                    "Key": [remark_key],
-                    "Value": [second_val if second_val else "None"]
-                })
-                df = pd.concat([df, new_row], ignore_index=True)
+            record.update(key, first_number)
 
-        return df
+            # Agregar una fila de remark por cada valor
+            for second_val in second_values:
+                record.append(remark_key, second_val if second_val else "None")
 
 
 
 #    "Axle(s) track – 1 / 2": "axle_track",                          # B4
 
-    def _add_axle_track(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _add_axle_track(self, record: VehicleRecord) -> None:
         """Procesa y combina la información de los ejes."""
-        if "Axle(s) track – 1" in df["Key"].values and "Axle(s) track – 2" in df["Key"].values:
-            track1 = df[df["Key"] == "Axle(s) track – 1"]["Value"].values[0]
-            track2 = df[df["Key"] == "Axle(s) track – 2"]["Value"].values[0]
+        if "Axle(s) track – 1" in record and "Axle(s) track – 2" in record:
+            track1 = record.first("Axle(s) track – 1")
+            track2 = record.first("Axle(s) track – 2")
 
             max_track1 = self._get_max_value(track1)
             max_track2 = self._get_max_value(track2)
 
-            df = df[df["Key"] != "Axle(s) track – 2"]
-            mask = df["Key"] == "Axle(s) track – 1"
-            df.loc[mask, "Value"] = f"{max_track1}/{max_track2}"
-            df.loc[mask, "Key"] = "axle_track"
-
-        return df
+            record.remove("Axle(s) track – 2")
+            record.set("Axle(s) track – 1", f"{max_track1}/{max_track2}")
+            record.rename("Axle(s) track – 1", "axle_track")
 
 
 
@@ -173,66 +149,52 @@ class VehicleDataTransformer_site2:
 
 #    "Rear overhang": "rear_overhang",                               # B8
 
-    def _add_rear_overhang(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _add_rear_overhang(self, record: VehicleRecord) -> None:
         """Procesa y combina la información de Rear overhang"""
-        if "rear_overhang" in df["Key"].values:
-            rear = df[df["Key"] == "rear_overhang"]["Value"].values[0]
+        if "rear_overhang" in record:
+            rear = record.first("rear_overhang")
 
             # elimina el primer "/" de "/ 869 - 869"
             rear = rear.split("/")[1]
 
             # guarda el nuevo valor
-            df.loc[df["Key"] == "rear_overhang", "Value"] = rear
-
-
-        return df
+            record.set("rear_overhang", rear)
 
 
 #    "Distribution of this mass among the axles – 1 / 2": "mass_distribution",      # B11
 #    "Technically permissible max mass on each axle – 1 / 2": "max_axle_mass",      # B12
 
-    def _process_axles_distribution_maxmass(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _process_axles_distribution_maxmass(self, record: VehicleRecord) -> None:
         """Procesa y combina la información de distribución de masas."""
         key1 = "Distribution of this mass among the axles - 1"
         key2 = "Distribution of this mass among the axles - 2"
 
-        if key1 in df["Key"].values and key2 in df["Key"].values:
-            mass1_pair = df[df["Key"] == key1]["Value"].values[0]
-            mass2_pair = df[df["Key"] == key2]["Value"].values[0]
+        if key1 in record and key2 in record:
+            mass1_pair = record.first(key1)
+            mass2_pair = record.first(key2)
 
             mass1 = self._get_max_from_pair(mass1_pair, '-')
             mass2 = self._get_max_from_pair(mass2_pair, '-')
 
-            df = df[~df["Key"].isin([key1, key2])]
+            record.remove(key1, key2)
 
-            new_row_1 = pd.DataFrame({
-                "Key": ["mass_distribution"],
-                "Value": [f"{mass1}/{mass2}"]
-            })
-            df = pd.concat([df, new_row_1], ignore_index=True)
-
-            new_row_2 = pd.DataFrame({
-                "Key": ["max_axle_mass"],
-                "Value": [f"{mass1}/{mass2}"]
-            })
-            df = pd.concat([df, new_row_2], ignore_index=True)
-
-        return df
+            record.append("mass_distribution", f"{mass1}/{mass2}")
+            record.append("max_axle_mass", f"{mass1}/{mass2}")
 
 
 
 #   "Maximum mass of trailer – braked / unbraked": "max_trailer_mass",             # B14
 
-    def _add_max_trailer_mass(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _add_max_trailer_mass(self, record: VehicleRecord) -> None:
         """
         Procesa y combina la información de masas del remolque,
         manteniendo los pares de valores originales separados por un guion,
         salvo que ambos pares sean 0 / 0.
         """
-        if "Braked trailer" in df["Key"].values and "Unbraked trailer" in df["Key"].values:
+        if "Braked trailer" in record and "Unbraked trailer" in record:
             # Obtiene los valores originales (ej: "1100 / 1200")
-            braked = df.loc[df["Key"] == "Braked trailer", "Value"].values[0]
-            unbraked = df.loc[df["Key"] == "Unbraked trailer", "Value"].values[0]
+            braked = record.first("Braked trailer")
+            unbraked = record.first("Unbraked trailer")
 
             # Separa los pares en enteros
             braked_vals = [int(x.strip()) for x in braked.split("/")]
@@ -240,124 +202,80 @@ class VehicleDataTransformer_site2:
 
             # Verifica si ambos pares son 0 / 0
             if braked_vals == [0, 0] and unbraked_vals == [0, 0]:
-                return df  # No se agrega nada nuevo
+                return  # No se agrega nada nuevo
 
             # Construye el nuevo valor combinado
             combined_value = f"{braked_vals[0]}/{unbraked_vals[0]} - {braked_vals[1]}/{unbraked_vals[1]}"
 
-            # Elimina las filas originales
-            df = df[~df["Key"].isin(["Braked trailer", "Unbraked trailer"])]
-
-            # Agrega la nueva fila
-            new_row = pd.DataFrame({
-                "Key": ["max_trailer_mass"],
-                "Value": [combined_value]
-            })
-
-            df = pd.concat([df, new_row], ignore_index=True)
-
-        return df
+            # Elimina las filas originales y agrega la nueva
+            record.remove("Braked trailer", "Unbraked trailer")
+            record.append("max_trailer_mass", combined_value)
 
 
 
 #    "Maximum vertical load at the coupling point for a trailer": "max_coupling_load", # B16
 
 
-    def _add_max_coupling_load(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _add_max_coupling_load(self, record: VehicleRecord) -> None:
         """Procesa y transforma Maximum vertical load at the coupling point for a trailer"""
-        if "Support load" in df["Key"].values:
+        if "Support load" in record:
             # Obtiene los valores originales
-            vertical_values = df[df["Key"] == "Support load"]["Value"].values[0]      # ej: "600 / 1000"
+            vertical_values = record.first("Support load")      # ej: "600 / 1000"
 
             # Obtiene el máximo de cada par
             vertical_value_max = self._get_max_from_pair(vertical_values, '/')     # resultado: 1000
 
-            # Elimina las filas originales
-            df = df[~df["Key"].isin(["Support load"])]
-
-            # Crea una nueva fila con los máximos
-            new_row = pd.DataFrame({
-                "Key": ["max_coupling_load"],
-                "Value": [f"{vertical_value_max}"]  # Resultado: "1000 / 1222"
-            })
-
-            df = pd.concat([df, new_row], ignore_index=True)
-
-        return df
+            # Elimina las filas originales y crea una nueva con el máximo
+            record.remove("Support load")
+            record.append("max_coupling_load", f"{vertical_value_max}")
 
 
 #    "Engine manufacturer": "engine_manufacturer",                                  # B17
 #    "Engine code as marked on the enginee": "engine_code",                         # B18 
 
 
-    def _process_engines(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _process_engines(self, record: VehicleRecord) -> None:
       """Obtiene la marca del motor"""
-      if "Brand / Type" in df["Key"].values:
-        brandType = df[df["Key"] == "Brand / Type"]["Value"].values[0]
+      if "Brand / Type" in record:
+        brandType = record.first("Brand / Type")
 
         brand = self._get_value_slash(brandType, 0)
 
         parts = [part.strip() for part in brandType.split("/")]
         type_Name = " / ".join(parts[1:])
 
-        new_row = pd.DataFrame({
-            "Key": ["engine_manufacturer"],
-            "Value": [f"{brand}"]
-        })
-        df = pd.concat([df, new_row], ignore_index=True)
-
-        new_row2 = pd.DataFrame({
-              "Key": ["engine_code"],
-              "Value": [f"{type_Name}"]
-          })
-        df = pd.concat([df, new_row2], ignore_index=True)
+        record.append("engine_manufacturer", f"{brand}")
+        record.append("engine_code", f"{type_Name}")
 
-        df = df[~df["Key"].isin(["Brand / Type"])]
-      return df
+        record.remove("Brand / Type")
 
 
 #    "Working principle": "working_principle",                                      # B19
 
-    def _add_working_principle(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _add_working_principle(self, record: VehicleRecord) -> None:
         """Añade la clave 'Working principle' con el valor correspondiente."""
-        if "fuel" in df["Key"].values:
-            fuel_value = df[df["Key"] == "fuel"]["Value"].values[0]
+        if "fuel" in record:
+            fuel_value = record.first("fuel")
 
             if fuel_value == "Diesel / Electric" or fuel_value == "Diesel":
-                new_row = pd.DataFrame({
-                    "Key": ["working_principle"],
-                    "Value": ["Common Rail"]
-                })
+                record.append("working_principle", "Common Rail")
             elif fuel_value == "Gasoline / Electric" or fuel_value == "Gasoline":
-                new_row = pd.DataFrame({
-                    "Key": ["working_principle"],
-                    "Value": ["Spark Ignition, 4-stroke"]
-                })
+                record.append("working_principle", "Spark Ignition, 4-stroke")
             elif fuel_value == "Electric":
-                new_row = pd.DataFrame({
-                    "Key": ["working_principle"],
-                    "Value": ["BEV"]
-                })
-            else:
-                new_row = pd.DataFrame()  # En caso de que no coincida con nada
-
-            if not new_row.empty:
-                df = pd.concat([df, new_row], ignore_index=True)
-
-        return df
+                record.append("working_principle", "BEV")
+            # En caso de que no coincida con nada no se agrega
 
 # B20: "Direct injection": "direct_injection",
 
-    def _add_direct_injection(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _add_direct_injection(self, record: VehicleRecord) -> None:
         """Añade la clave 'direct_injection' con el valor correspondiente,
         manejando posibles variaciones en el formato de 'Design type'."""
 
-        if "Design type" in df["Key"].values:
-            mask = df["Key"] == "Design type"
-            design_type_value = df.loc[mask, "Value"].iloc[0] # Usar .loc y .iloc[0] para mayor seguridad
+        if "Design type" in record:
+            design_type_value = record.first("Design type")
 
             if pd.isna(design_type_value): # Manejar NaN
-                return df
+                return
 
             parts = [part.strip() for part in str(design_type_value).split("/")]
 
@@ -368,73 +286,44 @@ class VehicleDataTransformer_site2:
                 new_value = "Yes"
             # else: new_value ya es "No" por defecto
 
-            new_row = pd.DataFrame({
-                "Key": ["direct_injection"],
-                "Value": [new_value]
-            })
-
-            df = pd.concat([df, new_row], ignore_index=True)
-
-        return df
+            record.append("direct_injection", new_value)
 
 
 #    "Pure electric": "pure_electric",                                              # B21    
-    def _add_electric_vehicle(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _add_electric_vehicle(self, record: VehicleRecord) -> None:
             """Añade la clave 'Electric vehicle' con el valor correspondiente."""
-            if "fuel" in df["Key"].values:
-                fuel_value = df[df["Key"] == "fuel"]["Value"].values[0]
+            if "fuel" in record:
+                fuel_value = record.first("fuel")
 
                 if fuel_value == "Electric":
-                    new_row = pd.DataFrame({
-                        "Key": ["pure_electric"],
-                        "Value": ["Yes"]
-                    })
+                    record.append("pure_electric", "Yes")
                 else:
-                    new_row = pd.DataFrame({
-                        "Key": ["pure_electric"],
-                        "Value": ["No"]
-                    })
-
-                df = pd.concat([df, new_row], ignore_index=True)
-
-            return df        
-    
+                    record.append("pure_electric", "No")
 
 #    "Hybrid [electric] vehicle": "hybrid",                                         # B22
 
-    def _add_hybrid_electric_vehicle(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _add_hybrid_electric_vehicle(self, record: VehicleRecord) -> None:
         """Nos dice si es hibrido o no"""
 
-        if "fuel" in df["Key"].values:
-            fuel_value = df[df["Key"] == "fuel"]["Value"].values[0]
+        if "fuel" in record:
+            fuel_value = record.first("fuel")
 
             if "Diesel / Electric" in fuel_value or "Gasoline / Electric" in fuel_value:
-                new_row = pd.DataFrame({
-                    "Key": ["hybrid"],
-                    "Value": ["Yes"]
-                })
+                record.append("hybrid", "Yes")
             else:
-                new_row = pd.DataFrame({
-                    "Key": ["hybrid"],
-                    "Value": ["No"]
-                })
-
-            df = pd.concat([df, new_row], ignore_index=True)
-
-        return df
+                record.append("hybrid", "No")
 
 # B23: "Number and arrangement of cylinders": "cylinders",
 
-    def _add_cylinders(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _add_cylinders(self, record: VehicleRecord) -> None:
         """Añade la clave 'cylinders' con el valor correspondiente,
         manejando posibles variaciones en el formato de 'Design type'."""
 
-        if "Design type" in df["Key"].values:
-            mask = df["Key"] == "Design type"
-            design_type_value = df.loc[mask, "Value"].iloc[0]
+        if "Design type" in record:
+            design_type_value = record.first("Design type")
 
             if pd.isna(design_type_value):
-                return df
+                return
 
             parts = [part.strip() for part in str(design_type_value).split("/")]
 
@@ -459,22 +348,14 @@ class VehicleDataTransformer_site2:
 
             # Si 'cyl_value' no pudo ser extraído (len(parts) <= 2), 'new_value' permanece "Unknown"
 
-            new_row = pd.DataFrame({
-                "Key": ["cylinders"],
-                "Value": [new_value]
-            })
-
-            df = pd.concat([df, new_row], ignore_index=True)
-
-        return df  
-    
+            record.append("cylinders", new_value)
 
 #   "Maximum net power": "max_power",                                              # B26
 
-    def _add_max_power(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _add_max_power(self, record: VehicleRecord) -> None:
         """Procesa y combina la información la capacidad maxima."""
-        if "max_power" in df["Key"].values:
-            power = df[df["Key"] == "max_power"]["Value"].values[0]
+        if "max_power" in record:
+            power = record.first("max_power")
 
             num1 = float(self._get_value_slash(power, 0))
             num2 = float(self._get_value_slash(power, 1))
@@ -486,18 +367,13 @@ class VehicleDataTransformer_site2:
             new_value = f"{num1}/{num2}"
 
 
-            df.loc[df["Key"] == "max_power", "Value"] = new_value
-
-        return df
-    
-
-    
+            record.set("max_power", new_value)
 
 #    "Clutch": "clutch_type",                                                       # B27
 #    "Gearbox": "gearbox_type",                                                     # B28
 #    "Gear": "gear",                                                                # B29
 
-    def _process_transmission(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _process_transmission(self, record: VehicleRecord) -> None:
         """Procesa la información de transmission y agrega nuevos registros según el formato especificado.
 
         Casos contemplados:
@@ -521,8 +397,8 @@ class VehicleDataTransformer_site2:
             - 29. Gearbox (type) => "Automatic"
             - 29.1 Gear: => 1
         """
-        if "Transmission/IA" in df["Key"].values:
-            transmission = df[df["Key"] == "Transmission/IA"]["Value"].values[0]
+        if "Transmission/IA" in record:
+            transmission = record.first("Transmission/IA")
             # Extraemos el primer segmento (suponiendo que es el que contiene la info relevante)
             transmission_spec = self._get_value_slash(transmission, 0).strip().lower()
 
@@ -530,27 +406,25 @@ class VehicleDataTransformer_site2:
             gearbox = "Unknown"
             gear = None
 
+            match_dual_clutch = patterns.TRANSMISSION_DUAL_CLUTCH.match(transmission_spec)
+            match_automatic = patterns.TRANSMISSION_AUTOMATIC.match(transmission_spec)
+            match_manual = patterns.TRANSMISSION_MANUAL.match(transmission_spec)
+
             # Caso 1: 'mXa' (ej: m8a)
-            if re.match(r'^m(\d+)a$', transmission_spec):
+            if match_dual_clutch:
                 clutch_type = "Dual clutch"
                 gearbox = "Automatic"
-                match = re.match(r'^m(\d+)a$', transmission_spec)
-                if match:
-                    gear = int(match.group(1))
+                gear = int(match_dual_clutch.group(1))
             # Caso 2: 'aX' (ej: a8)
-            elif re.match(r'^a(\d+)$', transmission_spec):
+            elif match_automatic:
                 clutch_type = "Single plate dry"
                 gearbox = "Automatic"
-                match = re.match(r'^a(\d+)$', transmission_spec)
-                if match:
-                    gear = int(match.group(1))
+                gear = int(match_automatic.group(1))
             # Caso 3: 'mX' (ej: m6)
-            elif re.match(r'^m(\d+)$', transmission_spec):
+            elif match_manual:
                 clutch_type = "Single plate dry"
                 gearbox = "Manual"
-                match = re.match(r'^m(\d+)$', transmission_spec)
-                if match:
-                    gear = int(match.group(1))
+                gear = int(match_manual.group(1))
             # Caso 4: 's'
             elif transmission_spec == "s":
                 clutch_type = "Continuously Variable"
@@ -558,36 +432,22 @@ class VehicleDataTransformer_site2:
                 gear = 1
 
             # Agregar registro para "28. Clutch /type"
-            new_row_clutch = pd.DataFrame({
-                "Key": ["clutch_type"],
-                "Value": [clutch_type]
-            })
-            df = pd.concat([df, new_row_clutch], ignore_index=True)
+            record.append("clutch_type", clutch_type)
 
             # Agregar registro para "29. Gearbox (type)"
-            new_row_gearbox = pd.DataFrame({
-                "Key": ["gearbox_type"],
-                "Value": [gearbox]
-            })
-            df = pd.concat([df, new_row_gearbox], ignore_index=True)
+            record.append("gearbox_type", gearbox)
 
             # Agregar registro para "29.1 Gear:" solo si se pudo extraer un número
             if gear is not None:
-                new_row_gear = pd.DataFrame({
-                    "Key": ["gear"],
-                    "Value": [str(gear)]
-                })
-                df = pd.concat([df, new_row_gear], ignore_index=True)
-
-        return df
+                record.append("gear", str(gear))
 
 
 #    "Final drive ratio": "final_drive_ratio",                                      # B30
 
-    def _add_final_drive_ratio(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _add_final_drive_ratio(self, record: VehicleRecord) -> None:
         """Procesa la drive ratio"""
-        if "Transmission/IA" in df["Key"].values:
-            drive = df[df["Key"] == "Transmission/IA"]["Value"].values[0]
+        if "Transmission/IA" in record:
+            drive = record.first("Transmission/IA")
 
             drive_value = self._get_value_slash(drive, 1)
 
@@ -597,48 +457,28 @@ class VehicleDataTransformer_site2:
             # Reemplazar coma por punto
             drive_value = drive_value.replace(",", ".")
 
-            new_row = pd.DataFrame({
-                "Key": ["final_drive_ratio"],
-                "Value": [f"{drive_value}"]
-            })
-            df = pd.concat([df, new_row], ignore_index=True)
-            df = df[~df["Key"].isin(["Transmission/IA"])]
-
-        return df
+            record.append("final_drive_ratio", f"{drive_value}")
+            record.remove("Transmission/IA")
 
 #   "EC type approval mark of couplind device if fitted": "coupling_approval",     # B40
 
-    def _add_coupling_approval(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _add_coupling_approval(self, record: VehicleRecord) -> None:
         """Añade la clave 'coupling_approval' con el valor correspondiente."""
-        if "Remark 56" in df["Key"].values:            
-            coupling_value = df[df["Key"] == "Remark 56"]["Value"].values[0]
+        if "Remark 56" in record:
+            coupling_value = record.first("Remark 56")
             #Utiliza la funcion extract_marks_simple para extraer el valor de Remark 56
             coupling_value = self.extract_marks_simple(coupling_value)
 
-            new_row = pd.DataFrame({
-                "Key": ["coupling_approval"],
-                "Value": [coupling_value]
-            })
-            df = pd.concat([df, new_row], ignore_index=True)
-
-        return df
+            record.append("coupling_approval", coupling_value)
 
 
     @staticmethod
     def extract_marks_simple(text: str) -> str:
-        claves = [
-            'Konformitätszeichen',
-            'Genehmigungszeichen',
-            'Genehmigungsnummer'
-        ]
         resultados: List[str] = []
 
-        # 1) Si hay alguna clave, extraer desde la clave hasta 3 espacios consecutivos o fin de línea
-        for clave in claves:
-            patron_clave = re.compile(
-                rf'{re.escape(clave)}\s*[:\-]?\s*(.+?)(?=\s{{3,}}|$)',
-                flags=re.IGNORECASE
-            )
+        # 1) Si hay alguna clave (Konformitätszeichen, Genehmigungszeichen, Genehmigungsnummer),
+        #    extraer desde la clave hasta 3 espacios consecutivos o fin de línea
+        for patron_clave in patterns.MARK_KEYWORDS:
             for frag in patron_clave.findall(text):
                 frag_limpio = frag.strip()
                 if frag_limpio:
@@ -647,8 +487,7 @@ class VehicleDataTransformer_site2:
         # 2) Si NO encontramos nada con clave, aplicar regex general
         if not resultados:
             # Empieza por e/E + dígitos, captura todo hasta 3 espacios o final de línea
-            patron_global = re.compile(r'\b[eE]\d+.*?(?=\s{3,}|$)')
-            for m in patron_global.findall(text):
+            for m in patterns.MARK_GLOBAL.findall(text):
                 cad = m.strip()
                 # Verificar longitud mínima para evitar falsos positivos
                 if len(cad) > 4:
@@ -673,7 +512,7 @@ class VehicleDataTransformer_site2:
 #    "Maximum speed": "max_speed",                                                  # B41
 
 
-    def _add_max_speed(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _add_max_speed(self, record: VehicleRecord) -> None:
       """
       Procesa la velocidad máxima según el tipo de transmisión.
 
@@ -683,13 +522,13 @@ class VehicleDataTransformer_site2:
       """
 
             
-      if "gearbox_type" in df["Key"].values and "19 Vehicle VMax" in df["Key"].values:
-          gearbox_val = df[df["Key"] == "gearbox_type"]["Value"].values[0].strip().lower()
-          vmax_val = df[df["Key"] == "19 Vehicle VMax"]["Value"].values[0]
+      if "gearbox_type" in record and "19 Vehicle VMax" in record:
+          gearbox_val = record.first("gearbox_type").strip().lower()
+          vmax_val = record.first("19 Vehicle VMax")
 
           # Buscar los números asociados a 'mech' y 'autom'
-          match_mech = re.search(r'mech\s*(\d+)', vmax_val, re.IGNORECASE)
-          match_autom = re.search(r'autom\s*(\d+)', vmax_val, re.IGNORECASE)
+          match_mech = patterns.VMAX_MECH.search(vmax_val)
+          match_autom = patterns.VMAX_AUTOM.search(vmax_val)
 
           maximum_speed = None
           if gearbox_val == "manual" and match_mech:
@@ -697,24 +536,18 @@ class VehicleDataTransformer_site2:
           elif gearbox_val == "automatic" and match_autom:
               maximum_speed = match_autom.group(1)
           else:
-               if df[df["Key"] == "fuel"]["Value"].values[0] == "Electric":
+               if record.values("fuel")[0] == "Electric":
                   maximum_speed = match_mech.group(1)
                else:
                   maximum_speed = "-"
 
           # Agregar el registro de "Maximum speed"
-          new_row = pd.DataFrame({
-              "Key": ["max_speed"],
-              "Value": [maximum_speed]
-          })
-          df = pd.concat([df, new_row], ignore_index=True)
+          record.append("max_speed", maximum_speed)
 
-      return df
 
 
 
-
-    def _aux_emissions(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _aux_emissions(self, record: VehicleRecord) -> None:
       """
       Procesa los registros de emisiones.
 
@@ -730,44 +563,38 @@ class VehicleDataTransformer_site2:
             • Si es "Automatic", se seleccionan los registros que contengan "(autom)".
           Luego se "limpia" la key removiendo el sufijo y se crea el nuevo registro.
       """
-      new_rows = []
-
-      # Contar cuántos registros de Transmission hay
-      transmissions = df[df["Key"].str.contains("72 Emissions - Transmission", regex=False)]
-      count_transmissions = len(transmissions)
+      # Una sola pasada: se separan las filas de emisiones y se cuentan los registros de Transmission
+      emission_rows = []
+      count_transmissions = 0
+      for key, value in record.items():
+          if "72 Emissions - Transmission" in key:
+              count_transmissions += 1
+          if key.startswith("72 Emissions -"):
+              emission_rows.append((key, value))
 
+      new_rows = []
       if count_transmissions == 1:
           # Solo hay un grupo: se procesan todos los registros de emisiones (excepto el de Transmission)
-          for index, row in df.iterrows():
-              key = row["Key"]
-              if key.startswith("72 Emissions -") and "Transmission" not in key:
-                  # Eliminar el prefijo "72 Emissions - " y quitar cualquier sufijo entre paréntesis
-                  emission_type = re.sub(r'72 Emissions -\s*', '', key)
-                  emission_type = re.sub(r'\s*\(.*\)', '', emission_type)
-                  new_key = f"Emissions {emission_type}"
-                  new_rows.append({"Key": new_key, "Value": row["Value"]})
+          # quitando el prefijo "72 Emissions - " y cualquier sufijo entre paréntesis
+          new_rows = [
+              (_emission_key(key, None), value)
+              for key, value in emission_rows if "Transmission" not in key
+          ]
       elif count_transmissions == 2:
           # Se consultará el valor del Gearbox para decidir qué grupo usar
-          gearbox_row = df[df["Key"] == "gearbox_type"]
-          if not gearbox_row.empty:
-              gearbox_val = gearbox_row["Value"].values[0].strip().lower()
+          if "gearbox_type" in record:
+              gearbox_val = record.first("gearbox_type").strip().lower()
               # Seleccionar el sufijo según el tipo de caja
               chosen_suffix = "(mec)" if gearbox_val == "manual" else "(autom)" if gearbox_val == "automatic" else ""
-              for index, row in df.iterrows():
-                  key = row["Key"]
-                  if key.startswith("72 Emissions -") and chosen_suffix in key:
-                      # Quitar el prefijo y el sufijo elegido
-                      emission_type = re.sub(r'72 Emissions -\s*', '', key)
-                      emission_type = emission_type.replace(chosen_suffix, "").strip()
-                      new_key = f"Emissions {emission_type}"
-                      new_rows.append({"Key": new_key, "Value": row["Value"]})
-
-      # Se crean los nuevos registros y se concatenan al DataFrame original
-      if new_rows:
-          new_df = pd.DataFrame(new_rows)
-          df = pd.concat([df, new_df], ignore_index=True)
+              # Quitar el prefijo y el sufijo elegido
+              new_rows = [
+                  (_emission_key(key, chosen_suffix), value)
+                  for key, value in emission_rows if chosen_suffix in key
+              ]
 
-      return df
+      # Se agregan los nuevos registros al final
+      for new_key, value in new_rows:
+          record.append(new_key, value)
 
 
 
@@ -777,7 +604,7 @@ class VehicleDataTransformer_site2:
 # B49: "Emissions HC NOx": "hc_nox_emissions",
 # B50: "Emissions particulates": "particulates",
 
-    def _process_emissions_values(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _process_emissions_values(self, record: VehicleRecord) -> None:
         """
         Transforma y renombra los valores de los registros de emisiones.
 
@@ -795,50 +622,28 @@ class VehicleDataTransformer_site2:
             "Emissions PM": "particulates",
         }
 
-        # Aplicar el mapeo de claves antes de procesar los valores
-        # Esto asegura que operamos en las claves finales
-        for old_key, new_key in emissions_key_mapping.items():
-            if old_key in df["Key"].values:
-                # Encuentra la máscara para la clave antigua
-                mask_old = df["Key"] == old_key
-                # Asigna la nueva clave
-                df.loc[mask_old, "Key"] = new_key
-
-        # Ahora, procesar los valores para las claves ya renombradas
-        # Filtrar filas cuyas claves renombradas comiencen con "co_", "hc_", "nox_", "particulates"
-        # o directamente las nuevas claves si no quieres depender del prefijo
-        # Aquí es importante ser específico si "Emissions" ya no está en la clave
-        emissions_processed_mask = df["Key"].isin(emissions_key_mapping.values())
-
-        for idx in df[emissions_processed_mask].index:
-            valor = df.loc[idx, "Value"]
+        def format_value(valor, decimals):
             try:
                 # Convertir el valor a float
                 num = float(valor)
-                if num == 0.0:
-                    df.loc[idx, "Value"] = "- - - -"
-                else:
-                    #Si no es particulates entonces dividir el valor por 1000 y formatear a 5 decimales
-                    if "particulates" == df.loc[idx, "Key"]:
-                        nuevo_valor = num / 1000
-                        df.loc[idx, "Value"] = f"{nuevo_valor:.5f}"
-                    else:    
-                        nuevo_valor = num / 1000
-                        df.loc[idx, "Value"] = f"{nuevo_valor:.4f}"
             except (ValueError, TypeError): # Añadido TypeError para manejar mejor NaN o non-numeric
                 # Si no se puede convertir a número, se deja el valor original
-                continue
-        return df
+                return valor
+            if num == 0.0:
+                return "- - - -"
+            # Dividir el valor por 1000: particulates con 5 decimales, el resto con 4
+            return f"{num / 1000:.{decimals}f}"
+
+        # Una pasada por clave: se renombra (las filas no se mueven) y se formatean
+        # solo las filas de esa clave, sin recorrer el resto del registro
+        for old_key, new_key in emissions_key_mapping.items():
+            record.rename(old_key, new_key)
+            decimals = 5 if new_key == "particulates" else 4
+            record.update(new_key, lambda valor: format_value(valor, decimals))
     
 
 
 
-
-
-    def _sort_and_clean(self, df: pd.DataFrame) -> pd.DataFrame:
-        df["Key"] = pd.Categorical(df["Key"], categories=self.config.ordered_keys, ordered=True)
-        return df.dropna(subset=['Key']).sort_values("Key").reset_index(drop=True)
-
     @staticmethod
     def _get_max_value(value: str) -> str:
         """Obtiene el valor máximo de un rango."""
@@ -1,51 +1,27 @@
-import pandas as pd
-from typing import Dict, List, Optional
-from dataclasses import dataclass
-import re
 from .master_keys import MASTER_ORDERED_KEYS
+from .base_transformer import BaseVehicleDataTransformer, VehicleDataConfig
+from .vehicle_record import VehicleRecord
 
 
-@dataclass
-class VehicleDataConfig:
-    """Configuración para la transformación de datos del vehículo."""
-    column_mapping: Dict[str, str]
-    ordered_keys: List[str]
-
-class VehicleDataTransformer_site3:
+class VehicleDataTransformer_site3(BaseVehicleDataTransformer):
     """Clase para transformar datos de vehículos."""
 
-    def __init__(self, config: VehicleDataConfig):
-        self.config = config
-
-    def transform(self, df_input: pd.DataFrame) -> pd.DataFrame:
-        """Método principal que orquesta la transformación de datos."""
-        df = df_input.copy()
-        df = self._rename_columns(df)
-        df = self._add_fuel(df)
-        df = self._add_braking_system_1(df)
-        df = self._add_braking_system_2(df)
-
-
-
-
-
-
+    def _apply_steps(self, record: VehicleRecord) -> None:
+        """Pasos de transformación del sitio 3, en orden.
 
-        df = self._add_missing_keys(df)
-        df = self._sort_and_clean(df)
-        return df
-
-    def _rename_columns(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Renombra las columnas según el mapeo configurado."""
-        df["Key"] = df["Key"].map(lambda x: self.config.column_mapping.get(x, x))
-        return df
+        Trabajan sobre un VehicleRecord (acceso por clave sin recorrer filas, sin pd.concat
+        por fila) con las claves ya renombradas.
+        """
+        self._add_fuel(record)
+        self._add_braking_system_1(record)
+        self._add_braking_system_2(record)
     
 
 #    "Fuel": "fuel",                                                                # B25
-    def _add_fuel(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _add_fuel(self, record: VehicleRecord) -> None:
         """Añade la clave 'fuel' con el valor correspondiente."""
-        if "fuel" in df["Key"].values:
-            raw_value = df[df["Key"] == "fuel"]["Value"].values[0].strip()
+        if "fuel" in record:
+            raw_value = record.first("fuel").strip()
             # Lista de siglas conocidas
             fuel_types = ["FHEV", "PHEV", "MHEV", "HEV"]
             
@@ -56,91 +32,32 @@ class VehicleDataTransformer_site3:
                     new_value = fuel
                     break
             
-            df.loc[df["Key"] == "fuel", "Value"] = new_value
-        
-        return df
+            record.set("fuel", new_value)
 
 
 
 #    "Suspension": "braking_system_1",                                              # B34
 
-    def _add_braking_system_1(self, df: pd.DataFrame) -> pd.DataFrame:
-        
-            if "Front suspension" in df["Key"].values and "Rear suspension" in df["Key"].values:
-                front_val = df[df["Key"] == "Front suspension"]["Value"].values[0]
-                rear_val = df[df["Key"] == "Rear suspension"]["Value"].values[0]
-
-                
-                new_row = pd.DataFrame({
-                    "Key": ["braking_system_1"],
-                    "Value": [f"{front_val}/{rear_val}"]
-                })
-
-            else:
-            
-                new_row = pd.DataFrame({
-                        "Key": ["braking_system_1"],
-                        "Value": [f"Independent type McPherson/Semi independent multilink"]
-                    })
-                    
-
-            df = pd.concat([df, new_row], ignore_index=True)  
-
-            
-
-            return df
+    def _add_braking_system_1(self, record: VehicleRecord) -> None:
+        if "Front suspension" in record and "Rear suspension" in record:
+            front_val = record.first("Front suspension")
+            rear_val = record.first("Rear suspension")
+            record.append("braking_system_1", f"{front_val}/{rear_val}")
+        else:
+            record.append("braking_system_1", "Independent type McPherson/Semi independent multilink")
 
 #    "Brakes": "braking_system_2",                                                  # B35
 
-    def _add_braking_system_2(self, df: pd.DataFrame) -> pd.DataFrame:
-            
-                if "Front brakes" in df["Key"].values and "Rear brakes" in df["Key"].values:
-                    front_val = df[df["Key"] == "Front brakes"]["Value"].values[0]
-                    rear_val = df[df["Key"] == "Rear brakes"]["Value"].values[0]
-
-                    
-                    new_row = pd.DataFrame({
-                        "Key": ["braking_system_2"],
-                        "Value": [f"{front_val}/{rear_val}"]
-                    })
-
-                else:
-                
-                    new_row = pd.DataFrame({
-                            "Key": ["braking_system_2"],
-                            "Value": [f"Ventilated discs/Ventilated discs"]
-                        })
-                        
-
-                df = pd.concat([df, new_row], ignore_index=True)  
-
-                
-
-                return df
-       
-                      
+    def _add_braking_system_2(self, record: VehicleRecord) -> None:
+        if "Front brakes" in record and "Rear brakes" in record:
+            front_val = record.first("Front brakes")
+            rear_val = record.first("Rear brakes")
+            record.append("braking_system_2", f"{front_val}/{rear_val}")
+        else:
+            record.append("braking_system_2", "Ventilated discs/Ventilated discs")
 
 
 
-    def _add_missing_keys(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Añade información sobre claves faltantes, asegurando que se incluyan todas las ordered_keys."""
-        missing_rows = [
-            {"Key": key, "Value": "None"}
-            for key in self.config.ordered_keys if key not in df["Key"].values
-        ]
-        if missing_rows:
-            df = pd.concat([df, pd.DataFrame(missing_rows)], ignore_index=True)
-        return df
-
-
-
-    def _sort_and_clean(self, df: pd.DataFrame) -> pd.DataFrame:
-        df["Key"] = pd.Categorical(df["Key"], categories=self.config.ordered_keys, ordered=True)
-        return df.dropna(subset=['Key']).sort_values("Key").reset_index(drop=True)
-
-    
-
-
 
 # Configuración predeterminada
 DEFAULT_CONFIG_3 = VehicleDataConfig(
@@ -0,0 +1,88 @@
+import pandas as pd
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+
+class VehicleRecord:
+    """Filas (Key, Value) de un vehículo en memoria, con acceso O(1) por clave.
+
+    Sustituye al DataFrame de dos columnas durante los pasos de transformación:
+    buscar una clave no recorre todas las filas y añadir una fila no copia la tabla
+    (como hacía cada pd.concat). Se convierte a DataFrame una sola vez al final.
+
+    Conserva el orden de inserción y admite claves repetidas (p. ej. "Brandstof #1"
+    y "Brandstof #2" que se renombran a la misma clave), igual que el DataFrame.
+    """
+
+    def __init__(self, rows: Iterable[Tuple[Any, Any]] = ()):
+        self._keys: List[Any] = []
+        self._values: List[Any] = []
+        self._positions: Dict[Any, List[int]] = {}
+        for key, value in rows:
+            self.append(key, value)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "VehicleRecord":
+        return cls(zip(df["Key"].tolist(), df["Value"].tolist()))
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({"Key": self._keys, "Value": self._values})
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._positions
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def keys(self) -> Iterable[Any]:
+        """Claves distintas presentes."""
+        return self._positions.keys()
+
+    def first(self, key: Any, default: Any = None) -> Any:
+        """Valor de la primera fila con la clave (como df[df["Key"] == key]["Value"].values[0])."""
+        positions = self._positions.get(key)
+        return self._values[positions[0]] if positions else default
+
+    def values(self, key: Any) -> List[Any]:
+        """Valores de todas las filas con la clave, en orden."""
+        return [self._values[i] for i in self._positions.get(key, ())]
+
+    def update(self, key: Any, func: Callable[[Any], Any]) -> None:
+        """Aplica func al valor de cada fila con la clave (como df.loc[mask, "Value"].apply(func))."""
+        for i in self._positions.get(key, ()):
+            self._values[i] = func(self._values[i])
+
+    def set(self, key: Any, value: Any) -> None:
+        """Asigna el mismo valor a todas las filas con la clave."""
+        for i in self._positions.get(key, ()):
+            self._values[i] = value
+
+    def append(self, key: Any, value: Any) -> None:
+        self._positions.setdefault(key, []).append(len(self._keys))
+        self._keys.append(key)
+        self._values.append(value)
+
+    def columns(self) -> Tuple[List[Any], List[Any]]:
+        """Claves y valores como dos listas paralelas, en orden (sin copiarlas)."""
+        return self._keys, self._values
+
+    def items(self) -> List[Tuple[Any, Any]]:
+        """Todas las filas (clave, valor), en orden."""
+        return list(zip(self._keys, self._values))
+
+    def rename(self, key: Any, new_key: Any) -> None:
+        """Cambia la clave de todas las filas con key sin moverlas (como df.loc[mask, "Key"] = new_key)."""
+        positions = self._positions.pop(key, None)
+        if not positions:
+            return
+        for i in positions:
+            self._keys[i] = new_key
+        self._positions[new_key] = sorted(self._positions.get(new_key, []) + positions)
+
+    def remove(self, *keys: Any) -> None:
+        """Elimina todas las filas con esas claves (como df[~df["Key"].isin(keys)])."""
+        if not any(key in self._positions for key in keys):
+            return
+        rows = [(k, v) for k, v in zip(self._keys, self._values) if k not in keys]
+        self._keys, self._values, self._positions = [], [], {}
+        for key, value in rows:
+            self.append(key, value)
@@ -11,7 +11,11 @@ logging.basicConfig(
 )
 
 # Importamos los routers
-from .api.v1 import processing, auth, export, profile, downloads 
+from .api.v1 import processing, auth, export, profile, downloads, metrics, batch
+from .services.scraping_service import close_scrapers
+from .services.batch_service import batch_queue
+from .scraping.process_pool import get_default_cpu_pool
+from .scraping.executors import shutdown_executors
 
 app = FastAPI(
     title="Homologation Vehicle API",
@@ -33,6 +37,7 @@ app.add_middleware(
     allow_credentials=True, # Permite cookies/credenciales de autorización
     allow_methods=["*"],    # Permite todos los métodos (GET, POST, etc.)
     allow_headers=["*"],    # Permite todas las cabeceras
+    expose_headers=["X-Site-Status"],  # Estado por sitio de /process-vehicle, legible desde el frontend
 )
 # --- FIN DE LA CONFIGURACIÓN DE CORS ---
 
@@ -43,6 +48,8 @@ app.include_router(processing.router, prefix="/api/v1", tags=["Processing"])
 app.include_router(export.router, prefix="/api/v1", tags=["Export"]) 
 app.include_router(profile.router, prefix="/api/v1/profile", tags=["Profile"])
 app.include_router(downloads.router, prefix="/api/v1/downloads", tags=["Downloads"])
+app.include_router(metrics.router, prefix="/api/v1/metrics", tags=["Metrics"])
+app.include_router(batch.router, prefix="/api/v1/batch", tags=["Batch"])
 
 
 @app.get("/")
@@ -50,6 +57,25 @@ def home():
     return {"status": "Homologation Vehicle API is running!"}
 
 
+@app.on_event("startup")
+async def start_batch_workers():
+    # Workers de la cola de lotes (/api/v1/batch)
+    batch_queue.start()
+    # Arranca ya los procesos del pool de CPU (si está activado) para que la primera petición no espere
+    cpu_pool = get_default_cpu_pool()
+    if cpu_pool is not None:
+        cpu_pool.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_scrapers():
+    await batch_queue.stop()
+    # Libera las conexiones keep-alive abiertas por los scrapers
+    await close_scrapers()
+    # Hilos de los executors por etapa (fetch, cpu, render)
+    shutdown_executors(wait=False)
+
+
 
 
     # nsaodnaosndas
\ No newline at end of file
@@ -1,19 +1,411 @@
+import asyncio
+import contextlib
+import logging
+import re
+import time
+from typing import Dict, Optional, Pattern
+from urllib.parse import urlsplit
+
+import httpx
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer
+from decouple import config
+
+from .html_cache import HtmlCache, canonical_url, get_default_html_cache
+from .result_cache import ResultCache, get_default_result_cache
+from .rate_limiter import HostLimiter, get_default_host_limiter
+from .errors import DeadlineExceeded, FetchConnectionError, FetchError, FetchHTTPError, FetchTimeout
+from .resilience import CircuitBreaker, RetryPolicy
+from .process_pool import CpuPool, get_default_cpu_pool, parse_html_task
+from .executors import cpu_executor, fetch_executor
+from . import deadline
+
+# Configuración del pool de conexiones keep-alive (se puede sobreescribir desde .env)
+SCRAPER_POOL_CONNECTIONS = config("SCRAPER_POOL_CONNECTIONS", default=4, cast=int)  # hosts distintos por scraper
+SCRAPER_POOL_MAXSIZE = config("SCRAPER_POOL_MAXSIZE", default=10, cast=int)          # conexiones por host
+SCRAPER_TIMEOUT = config("SCRAPER_TIMEOUT", default=10, cast=float)
+# Un host caído se detecta en la conexión: no hace falta esperar el timeout de lectura completo
+SCRAPER_CONNECT_TIMEOUT = config("SCRAPER_CONNECT_TIMEOUT", default=3, cast=float)
+# Parser HTML: "lxml", "html.parser" o "selectolax" (solo scrapers que lo soportan).
+# Vacío = el parser por defecto (html.parser).
+SCRAPER_HTML_PARSER = config("SCRAPER_HTML_PARSER", default="")
+# Construir solo la parte de la página que usa cada scraper (ver BaseScraper.parse_only)
+SCRAPER_PARSE_ONLY = config("SCRAPER_PARSE_ONLY", default=True, cast=bool)
+
+logger = logging.getLogger(__name__)
+
+
+def class_token(name: str) -> Pattern:
+    """Filtro de clase CSS para usar en un SoupStrainer.
+
+    Durante el parseo el atributo class todavía es una cadena ("cardetailsout car2"),
+    así que class_='cardetailsout' no coincidiría: se busca la clase como palabra suelta.
+    """
+    return re.compile(rf"(?:^|\s){re.escape(name)}(?:\s|$)")
+
 
 class BaseScraper:
-    def __init__(self, headers=None):
+    # Parser por defecto. lxml y selectolax son más rápidos, pero reparan el HTML mal
+    # formado de otra forma (el árbol puede cambiar): se activan con SCRAPER_HTML_PARSER.
+    # Las subclases con una ruta propia para selectolax sobreescriben parse_html (ver Site3Scraper).
+    default_parser = "html.parser"
+    # Filtro opcional: si se define, BeautifulSoup solo construye los nodos que
+    # coinciden (y sus descendientes) y descarta navegación, scripts, anuncios, etc.
+    parse_only: Optional[SoupStrainer] = None
+
+    def __init__(
+        self,
+        headers=None,
+        parser: Optional[str] = None,
+        pool_maxsize: Optional[int] = None,
+        html_cache: Optional[HtmlCache] = None,
+        result_cache: Optional[ResultCache] = None,
+        host_limiter: Optional[HostLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        cpu_pool: Optional[CpuPool] = None,
+    ):
         self.headers = headers or {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
+        self.parser = parser or SCRAPER_HTML_PARSER or self.default_parser
+        self.pool_maxsize = pool_maxsize or SCRAPER_POOL_MAXSIZE
+        # Cada scraper mantiene su propia sesión: las conexiones TCP+TLS se
+        # reutilizan entre peticiones al mismo host en lugar de abrirse cada vez.
+        self._adapter = HTTPAdapter(
+            pool_connections=SCRAPER_POOL_CONNECTIONS,
+            pool_maxsize=self.pool_maxsize,
+        )
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount('http://', self._adapter)
+        self.session.mount('https://', self._adapter)
 
-    def fetch_page(self, url):
+        # Caché HTML en disco compartida (None si está desactivada)
+        self.html_cache = html_cache if html_cache is not None else get_default_html_cache()
+        # Caché en memoria de los DataFrames ya parseados (None si está desactivada)
+        self.result_cache = result_cache if result_cache is not None else get_default_result_cache()
+        # Límite de concurrencia y ritmo por host, compartido entre scrapers (None si está desactivado)
+        self.host_limiter = host_limiter if host_limiter is not None else get_default_host_limiter()
+        # Reintentos de fallos transitorios y circuit breaker propio de este sitio
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(type(self).__name__)
+        # Pool de procesos para el parseo en scrape_async (None si está desactivado: se usa un hilo)
+        self.cpu_pool = cpu_pool if cpu_pool is not None else get_default_cpu_pool()
+
+        # Cliente asíncrono (se crea al primer uso, dentro del event loop)
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._async_stats: Dict[str, Dict[str, int]] = {}
+
+    # --- Descarga síncrona ---
+
+    def fetch_html(self, url: str) -> str:
+        """Descarga la página y devuelve el HTML sin parsear.
+
+        Si la página está en la caché y sigue fresca no se toca la red; si está
+        caducada se revalida con una petición condicional (304 = se reutiliza).
+        """
+        cached = self._cached_entry(url)
+        if cached is not None and cached.is_fresh(self.html_cache.ttl):
+            self.html_cache.record("hits")
+            return cached.body
+        probe = self.circuit_breaker.before_request(url)
+        try:
+            attempt = 0
+            while True:
+                try:
+                    html = self._fetch_once(url, cached)
+                except FetchError as e:
+                    time.sleep(self._retry_delay(url, e, attempt))
+                    attempt += 1
+                    continue
+                self.circuit_breaker.record_success()
+                return html
+        finally:
+            # Plazo agotado u otro error sin resultado para el circuit breaker: no debe quedar probando
+            self.circuit_breaker.release_probe(probe)
+
+    def _fetch_once(self, url: str, cached) -> str:
+        self._check_deadline(url)
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            return BeautifulSoup(response.text, 'html.parser')
+            response = self.session.get(
+                url,
+                timeout=(deadline.cap_timeout(SCRAPER_CONNECT_TIMEOUT), deadline.cap_timeout(SCRAPER_TIMEOUT)),
+                headers=cached.validators() if cached else None,
+            )
+        except requests.Timeout as e:
+            raise FetchTimeout(url, str(e)) from e
+        except requests.ConnectionError as e:
+            raise FetchConnectionError(url, str(e)) from e
         except requests.RequestException as e:
-            raise Exception(f"Error al realizar la solicitud: {e}")
+            raise FetchError(url, str(e)) from e
+        if cached is not None and response.status_code == 304:
+            return self._revalidated(cached)
+        self._check_status(url, response.status_code, response.headers)
+        return self._store(url, response.text, response.headers)
+
+    def _retry_delay(self, url: str, error: FetchError, attempt: int) -> float:
+        """Tras un intento fallido devuelve cuánto esperar antes de reintentar, o relanza el error.
+
+        No se reintenta si el error no es transitorio, si se agotaron los reintentos
+        o si la espera no cabe en el plazo de la petición.
+        """
+        if isinstance(error, DeadlineExceeded):
+            raise error
+        budget = deadline.remaining()
+        if budget is not None and budget <= 0:
+            # El timeout lo provocó el plazo total, no el sitio: no cuenta para el circuit breaker
+            raise DeadlineExceeded(url, "plazo agotado") from error
+        if self.retry_policy.should_retry(error, attempt):
+            delay = self.retry_policy.delay(error, attempt)
+            if budget is None or delay < budget:
+                logger.info(f"Reintento {attempt + 1} de {url} en {delay:.2f}s: {error}")
+                return delay
+        self.circuit_breaker.record_failure(error)
+        raise error
+
+    @staticmethod
+    def _check_deadline(url: str) -> None:
+        budget = deadline.remaining()
+        if budget is not None and budget <= 0:
+            raise DeadlineExceeded(url, "plazo agotado")
+
+    @staticmethod
+    def _check_status(url: str, status_code: int, headers) -> None:
+        if status_code < 400:
+            return
+        retry_after = headers.get("Retry-After")
+        try:
+            retry_after = float(retry_after) if retry_after else None
+        except ValueError:
+            retry_after = None  # Retry-After con fecha HTTP: se usa el backoff normal
+        raise FetchHTTPError(url, status_code, retry_after)
+
+    # --- Caché HTML ---
+
+    def _cached_entry(self, url: str):
+        if self.html_cache is None:
+            return None
+        entry = self.html_cache.get(url)
+        if entry is None:
+            self.html_cache.record("misses")
+        return entry
+
+    def _revalidated(self, entry) -> str:
+        self.html_cache.mark_revalidated(entry)
+        self.html_cache.record("revalidated")
+        return entry.body
+
+    def _store(self, url: str, html: str, headers) -> str:
+        if self.html_cache is not None:
+            self.html_cache.put(url, html, headers.get("ETag"), headers.get("Last-Modified"))
+        return html
+
+    def fetch_page(self, url):
+        return self.make_soup(self.fetch_html(url))
+
+    # --- Descarga asíncrona ---
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        # El cliente queda ligado al event loop en el que se creó: si cambia
+        # (p. ej. varias llamadas a asyncio.run) se crea uno nuevo.
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client.is_closed or self._async_client_loop is not loop:
+            self._async_client_loop = loop
+            self._async_client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=httpx.Timeout(SCRAPER_TIMEOUT, connect=SCRAPER_CONNECT_TIMEOUT),
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=self.pool_maxsize,
+                    max_keepalive_connections=self.pool_maxsize,
+                ),
+            )
+        return self._async_client
+
+    async def fetch_html_async(self, url: str) -> str:
+        """Versión asíncrona de fetch_page: la espera de red no ocupa ningún hilo.
 
-    def scrape(self, url):
+        Devuelve el HTML sin parsear; el parseo (CPU) lo hace scrape_async fuera del event loop.
+        """
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        host_stats = self._async_stats.setdefault(
+            f"{parts.scheme}://{parts.hostname}:{port}", {"requests": 0, "connections": 0}
+        )
+
+        async def trace(event_name, info):
+            if event_name == "connection.connect_tcp.complete":
+                host_stats["connections"] += 1
+
+        # La caché es E/S de disco: se consulta fuera del event loop
+        cached = await fetch_executor.run(self._cached_entry, url)
+        if cached is not None and cached.is_fresh(self.html_cache.ttl):
+            self.html_cache.record("hits")
+            return cached.body
+        probe = self.circuit_breaker.before_request(url)
+        try:
+            attempt = 0
+            while True:
+                try:
+                    # El hueco del limitador se ocupa solo durante la petición, no durante la espera entre reintentos
+                    async with self._host_slot(parts.hostname or ""):
+                        response = await self._get_async_once(url, cached, trace)
+                    host_stats["requests"] += 1
+                    if cached is not None and response.status_code == 304:
+                        html = await fetch_executor.run(self._revalidated, cached)
+                    else:
+                        self._check_status(url, response.status_code, response.headers)
+                        html = await fetch_executor.run(self._store, url, response.text, response.headers)
+                except FetchError as e:
+                    await asyncio.sleep(self._retry_delay(url, e, attempt))
+                    attempt += 1
+                    continue
+                self.circuit_breaker.record_success()
+                return html
+        finally:
+            # Plazo agotado, cancelación u otro error sin resultado: no debe quedar probando
+            self.circuit_breaker.release_probe(probe)
+
+    async def _get_async_once(self, url: str, cached, trace) -> httpx.Response:
+        self._check_deadline(url)
+        try:
+            return await self._get_async_client().get(
+                url,
+                headers=cached.validators() if cached else None,
+                timeout=httpx.Timeout(
+                    deadline.cap_timeout(SCRAPER_TIMEOUT),
+                    connect=deadline.cap_timeout(SCRAPER_CONNECT_TIMEOUT),
+                ),
+                extensions={"trace": trace},
+            )
+        except httpx.TimeoutException as e:
+            raise FetchTimeout(url, str(e) or type(e).__name__) from e
+        except httpx.TransportError as e:
+            raise FetchConnectionError(url, str(e) or type(e).__name__) from e
+        except httpx.HTTPError as e:
+            raise FetchError(url, str(e) or type(e).__name__) from e
+
+    def _host_slot(self, host: str):
+        # Sin limitador, un contexto vacío
+        if self.host_limiter is None:
+            return contextlib.nullcontext()
+        return self.host_limiter.limit(host)
+
+    # --- Parseo ---
+
+    def make_soup(self, html: str) -> BeautifulSoup:
+        # selectolax no construye un árbol de BeautifulSoup: si el scraper no tiene
+        # ruta propia para él, se usa lxml, que es el siguiente más rápido.
+        features = "lxml" if self.parser == "selectolax" else self.parser
+        parse_only = self.parse_only if SCRAPER_PARSE_ONLY else None
+        try:
+            return BeautifulSoup(html, features, parse_only=parse_only)
+        except FeatureNotFound:
+            logger.warning(f"Parser HTML '{features}' no disponible; se usa 'html.parser'.")
+            self.parser = "html.parser"
+            return BeautifulSoup(html, "html.parser", parse_only=parse_only)
+
+    def parse(self, soup: BeautifulSoup, *args, **kwargs):
         raise NotImplementedError("Este es implementado en subclases.")
+
+    def parse_html(self, html: str, *args, **kwargs):
+        return self.parse(self.make_soup(html), *args, **kwargs)
+
+    def on_fetch_error(self, url: str, error: Exception):
+        """Qué hacer si la descarga falla. Por defecto se propaga el error."""
+        raise error
+
+    def scrape(self, url, *args, **kwargs):
+        key = self._result_key(url, *args, **kwargs)
+        cached = self._cached_result(key)
+        if cached is not None:
+            return cached
+        try:
+            html = self.fetch_html(url)
+        except Exception as e:
+            return self.on_fetch_error(url, e)
+        return self._store_result(key, self.parse_html(html, *args, **kwargs))
+
+    async def scrape_async(self, url, *args, **kwargs):
+        """Descarga de forma asíncrona y solo envía el parseo a un hilo (o al pool de procesos)."""
+        key = self._result_key(url, *args, **kwargs)
+        cached = self._cached_result(key)
+        if cached is not None:
+            return cached
+        try:
+            html = await self.fetch_html_async(url)
+        except Exception as e:
+            return self.on_fetch_error(url, e)
+        if self.cpu_pool is not None:
+            df = await self.cpu_pool.run(parse_html_task, type(self), self.parser, html, args, kwargs)
+        else:
+            df = await cpu_executor.run(self.parse_html, html, *args, **kwargs)
+        return self._store_result(key, df)
+
+    # --- Caché de resultados parseados ---
+
+    def _result_key(self, url: str, *args, **kwargs):
+        """Clave: scraper + parser + URL canónica + opciones (p. ej. transmissionManual en el sitio 2).
+
+        El parser forma parte de la clave: otro parser puede dar otro árbol y otro resultado.
+        """
+        return (type(self).__name__, self.parser, canonical_url(url), args, tuple(sorted(kwargs.items())))
+
+    def _cached_result(self, key):
+        if self.result_cache is None:
+            return None
+        return self.result_cache.get(key)
+
+    def _store_result(self, key, df):
+        if self.result_cache is not None:
+            self.result_cache.put(key, df)
+        return df
+
+    # --- Métricas y cierre ---
+
+    def connection_stats(self) -> Dict[str, Dict[str, int]]:
+        """Devuelve, por host, cuántas peticiones se hicieron y cuántas conexiones nuevas hicieron falta.
+
+        'reused' es el número de peticiones que viajaron por una conexión keep-alive ya abierta.
+        Se suman las peticiones de la sesión síncrona y del cliente asíncrono.
+        """
+        stats = {}
+        pools = self._adapter.poolmanager.pools
+        for pool_key in pools.keys():
+            pool = pools.get(pool_key)
+            if pool is None:
+                continue
+            host = f"{pool.scheme}://{pool.host}:{pool.port}"
+            stats[host] = {"requests": pool.num_requests, "connections": pool.num_connections}
+
+        for host, async_stats in self._async_stats.items():
+            host_stats = stats.setdefault(host, {"requests": 0, "connections": 0})
+            host_stats["requests"] += async_stats["requests"]
+            host_stats["connections"] += async_stats["connections"]
+
+        for host_stats in stats.values():
+            host_stats["reused"] = max(host_stats["requests"] - host_stats["connections"], 0)
+        return stats
+
+    def resilience_stats(self) -> Dict[str, object]:
+        """Estado del circuit breaker del sitio y política de reintentos."""
+        return {
+            "circuit_breaker": self.circuit_breaker.stats(),
+            "retries": self.retry_policy.retries,
+        }
+
+    def close(self):
+        """Cierra la sesión y libera las conexiones del pool."""
+        self.session.close()
+
+    async def aclose(self):
+        """Cierra también el cliente asíncrono."""
+        if self._async_client is not None:
+            # Un cliente de otro event loop (ya cerrado) no se puede cerrar desde aquí
+            if self._async_client_loop is asyncio.get_running_loop():
+                await self._async_client.aclose()
+            self._async_client = None
+        self.close()
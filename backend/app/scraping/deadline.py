@@ -0,0 +1,57 @@
+# scraping/deadline.py
+
+import time
+from contextlib import contextmanager
+from contextvars import Context, ContextVar, copy_context
+from typing import Optional
+
+# Instante (time.monotonic) en el que vence el plazo de la petición en curso.
+# Al ser un ContextVar se propaga a las tareas de asyncio y a asyncio.to_thread.
+_deadline: ContextVar[Optional[float]] = ContextVar("scraping_deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]):
+    """Fija un plazo para todo lo que se ejecute dentro del bloque.
+
+    Si ya había un plazo más corto, se mantiene el más corto. None = sin plazo nuevo.
+    """
+    current = _deadline.get()
+    if seconds is None:
+        new = current
+    else:
+        new = time.monotonic() + seconds
+        if current is not None:
+            new = min(new, current)
+    token = _deadline.set(new)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def detached_context() -> Context:
+    """Copia del contexto actual sin plazo.
+
+    Para tareas compartidas entre llamantes con plazos distintos (ver SingleFlight):
+    cada llamante aplica su propio plazo al esperar el resultado.
+    """
+    context = copy_context()
+    context.run(_deadline.set, None)
+    return context
+
+
+def remaining() -> Optional[float]:
+    """Segundos que quedan del plazo actual (puede ser <= 0), o None si no hay plazo."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def cap_timeout(timeout: float) -> float:
+    """Recorta un timeout para que no supere lo que queda del plazo."""
+    budget = remaining()
+    if budget is None:
+        return timeout
+    return max(min(timeout, budget), 0.0)
@@ -0,0 +1,72 @@
+# scraping/dom_index.py
+
+from bisect import bisect_right
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from bs4 import BeautifulSoup, Tag
+
+StringFilter = Union[str, Callable[[Optional[str]], bool], None]
+
+
+class DomIndex:
+    """Índice de un documento construido con un único recorrido del árbol.
+
+    Agrupa las etiquetas por (nombre, clase) y por (nombre, texto) guardando su
+    posición en el orden del documento. Así find / find_next se resuelven con una
+    búsqueda binaria sobre el grupo correspondiente, en lugar de volver a recorrer
+    todo el soup en cada consulta.
+
+    Reproduce la semántica de BeautifulSoup que usan los scrapers:
+      - class_ coincide con una clase suelta o con el atributo class completo ("col-sm-7 cocInfo").
+      - string se compara con tag.string (texto exacto o función).
+      - find_next busca en los elementos posteriores en el documento, incluidos los descendientes.
+    """
+
+    def __init__(self, soup: BeautifulSoup):
+        self._positions: Dict[int, int] = {}
+        self._by_class: Dict[Tuple[str, Optional[str]], Tuple[List[int], List[Tag]]] = defaultdict(lambda: ([], []))
+        self._by_string: Dict[Tuple[str, str], List[Tag]] = defaultdict(list)
+
+        for position, node in enumerate(soup.find_all(True)):
+            self._positions[id(node)] = position
+            keys = {None}
+            classes = node.get("class")
+            if classes:
+                keys.update(classes)
+                keys.add(" ".join(classes))
+            for key in keys:
+                positions, nodes = self._by_class[(node.name, key)]
+                positions.append(position)
+                nodes.append(node)
+            text = node.string
+            if text is not None:
+                self._by_string[(node.name, str(text))].append(node)
+
+    @staticmethod
+    def _matches(node: Tag, string: StringFilter) -> bool:
+        if string is None:
+            return True
+        if callable(string):
+            return bool(string(node.string))
+        return node.string == string
+
+    def find_all(self, name: str, class_: Optional[str] = None) -> List[Tag]:
+        return list(self._by_class.get((name, class_), ([], []))[1])
+
+    def find(self, name: str, class_: Optional[str] = None, string: StringFilter = None) -> Optional[Tag]:
+        if class_ is None and isinstance(string, str):
+            matches = self._by_string.get((name, string))
+            return matches[0] if matches else None
+        for node in self._by_class.get((name, class_), ([], []))[1]:
+            if self._matches(node, string):
+                return node
+        return None
+
+    def find_next(self, node: Tag, name: str, class_: Optional[str] = None, string: StringFilter = None) -> Optional[Tag]:
+        positions, nodes = self._by_class.get((name, class_), ([], []))
+        start = bisect_right(positions, self._positions[id(node)])
+        for candidate in nodes[start:]:
+            if self._matches(candidate, string):
+                return candidate
+        return None
@@ -0,0 +1,56 @@
+# scraping/errors.py
+
+from typing import Optional
+
+
+class FetchError(Exception):
+    """Error al descargar una página.
+
+    `transient` indica si tiene sentido reintentar (timeout, conexión caída,
+    429 o 5xx). Un 404 o una URL mal formada no se arreglan reintentando.
+    """
+    transient = False
+
+    def __init__(self, url: str, message: str):
+        self.url = url
+        super().__init__(f"Error al realizar la solicitud: {message}")
+
+
+class FetchTimeout(FetchError):
+    """El servidor no respondió a tiempo."""
+    transient = True
+
+
+class FetchConnectionError(FetchError):
+    """No se pudo conectar (DNS, conexión rechazada o cortada)."""
+    transient = True
+
+
+class FetchHTTPError(FetchError):
+    """El servidor respondió con un código de error."""
+
+    RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+    def __init__(self, url: str, status_code: int, retry_after: Optional[float] = None):
+        self.status_code = status_code
+        self.retry_after = retry_after
+        super().__init__(url, f"HTTP {status_code} para {url}")
+
+    @property
+    def transient(self) -> bool:
+        return self.status_code in self.RETRYABLE_STATUS
+
+
+class CircuitOpenError(FetchError):
+    """El sitio ha fallado repetidamente: se rechaza la petición sin tocar la red."""
+
+    def __init__(self, url: str, retry_in: float):
+        self.retry_in = retry_in
+        super().__init__(url, f"sitio no disponible, se reintentará en {retry_in:.0f}s ({url})")
+
+
+class DeadlineExceeded(FetchError):
+    """Se agotó el plazo total de la petición antes de obtener la página.
+
+    No se reintenta ni cuenta para el circuit breaker: no indica que el sitio esté caído.
+    """
@@ -0,0 +1,134 @@
+# scraping/executors.py
+
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from decouple import config
+
+# Hilos por etapa del pipeline (se pueden sobreescribir desde .env). Cada etapa tiene su propio
+# executor: una ráfaga de exportaciones no deja sin hilos al scraping y viceversa.
+EXECUTOR_FETCH_WORKERS = config("EXECUTOR_FETCH_WORKERS", default=8, cast=int)    # caché HTML en disco
+EXECUTOR_CPU_WORKERS = config("EXECUTOR_CPU_WORKERS", default=4, cast=int)        # parseo, transformación y fusión
+EXECUTOR_RENDER_WORKERS = config("EXECUTOR_RENDER_WORKERS", default=2, cast=int)  # documentos DOCX / XLSX / CSV
+
+
+class StageExecutor:
+    """Pool de hilos de tamaño fijo para una etapa, con métricas de ocupación.
+
+    run() equivale a asyncio.to_thread (copia el contexto, así que el plazo de
+    deadline.py llega al hilo) pero sobre este pool en lugar del executor por defecto.
+    Las tareas que no caben esperan en la cola: queued y wait_avg_s indican si
+    la etapa necesita más hilos; utilization es la fracción del tiempo con hilos ocupados.
+    """
+
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = max(workers, 1)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._created_at = time.monotonic()
+        self._stats = {
+            "tasks": 0, "errors": 0, "queued": 0, "active": 0, "max_queued": 0,
+            "busy_s": 0.0, "wait_s": 0.0, "wait_max_s": 0.0,
+        }
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Se recrea si se apagó (p. ej. tras un shutdown de la aplicación en los tests)
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"{self.name}-")
+            return self._executor
+
+    @property
+    def queued(self) -> int:
+        """Tareas enviadas que esperan un hilo libre."""
+        return self._stats["queued"]
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        state = {"submitted": time.monotonic(), "started": False, "dropped": False}
+        call = functools.partial(context.run, self._timed, func, state, args, kwargs)
+        with self._lock:
+            self._stats["queued"] += 1
+            self._stats["max_queued"] = max(self._stats["max_queued"], self._stats["queued"])
+        try:
+            return await loop.run_in_executor(self._get_executor(), call)
+        except asyncio.CancelledError:
+            # Si la tarea no llegó a empezar, el executor la descarta: deja de contar como encolada
+            with self._lock:
+                if not state["started"]:
+                    state["dropped"] = True
+                    self._stats["queued"] -= 1
+            raise
+
+    def _timed(self, func: Callable, state: dict, args: tuple, kwargs: dict) -> Any:
+        started = time.monotonic()
+        wait = started - state["submitted"]
+        with self._lock:
+            state["started"] = True
+            if not state["dropped"]:
+                self._stats["queued"] -= 1
+            self._stats["active"] += 1
+            self._stats["wait_s"] += wait
+            self._stats["wait_max_s"] = max(self._stats["wait_max_s"], wait)
+        outcome = "errors"
+        try:
+            result = func(*args, **kwargs)
+            outcome = "tasks"
+            return result
+        finally:
+            with self._lock:
+                self._stats["active"] -= 1
+                self._stats[outcome] += 1
+                self._stats["busy_s"] += time.monotonic() - started
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        finished = stats["tasks"] + stats["errors"]
+        uptime = time.monotonic() - self._created_at
+        return {
+            "workers": self.workers,
+            "active": stats["active"],
+            "queued": stats["queued"],
+            "max_queued": stats["max_queued"],
+            "tasks": stats["tasks"],
+            "errors": stats["errors"],
+            "busy_s": round(stats["busy_s"], 4),
+            "wait_avg_s": round(stats["wait_s"] / finished, 4) if finished else 0.0,
+            "wait_max_s": round(stats["wait_max_s"], 4),
+            "utilization": round(stats["busy_s"] / (self.workers * uptime), 4) if uptime > 0 else 0.0,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+# Executors compartidos por etapa
+fetch_executor = StageExecutor("fetch", EXECUTOR_FETCH_WORKERS)
+cpu_executor = StageExecutor("cpu", EXECUTOR_CPU_WORKERS)
+render_executor = StageExecutor("render", EXECUTOR_RENDER_WORKERS)
+
+EXECUTORS = {
+    "fetch": fetch_executor,
+    "cpu": cpu_executor,
+    "render": render_executor,
+}
+
+
+def get_executor_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: executor.stats() for name, executor in EXECUTORS.items()}
+
+
+def shutdown_executors(wait: bool = True) -> None:
+    for executor in EXECUTORS.values():
+        executor.shutdown(wait=wait)
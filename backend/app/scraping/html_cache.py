@@ -0,0 +1,195 @@
+# scraping/html_cache.py
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from decouple import config
+
+logger = logging.getLogger(__name__)
+
+# Configuración de la caché en disco (se puede sobreescribir desde .env)
+SCRAPER_CACHE_ENABLED = config("SCRAPER_CACHE_ENABLED", default=True, cast=bool)
+SCRAPER_CACHE_DIR = config(
+    "SCRAPER_CACHE_DIR", default=os.path.join(tempfile.gettempdir(), "homologation_html_cache")
+)
+SCRAPER_CACHE_TTL = config("SCRAPER_CACHE_TTL", default=86400, cast=int)        # segundos
+SCRAPER_CACHE_MAX_MB = config("SCRAPER_CACHE_MAX_MB", default=200, cast=int)
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonical_url(url: str) -> str:
+    """Normaliza una URL para usarla como clave de caché.
+
+    Esquema y host en minúsculas, sin puerto por defecto, sin fragmento
+    y con los parámetros de la query ordenados.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path or "/"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+@dataclass
+class CacheEntry:
+    """Respuesta guardada en disco junto con sus validadores HTTP."""
+    url: str
+    body: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+    def is_fresh(self, ttl: int) -> bool:
+        return (time.time() - self.fetched_at) < ttl
+
+    def validators(self) -> Dict[str, str]:
+        """Cabeceras para una petición condicional (respuesta 304 si no cambió)."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HtmlCache:
+    """Caché de páginas HTML en disco con TTL, revalidación condicional y expulsión LRU.
+
+    Cada URL canónica se guarda en un único fichero JSON. La fecha de modificación
+    del fichero se actualiza en cada lectura y sirve como marca de "último uso":
+    cuando el tamaño total supera el máximo se borran primero los menos usados.
+    """
+
+    def __init__(self, directory: str, ttl: int, max_bytes: int):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "revalidated": 0, "misses": 0, "stores": 0, "evictions": 0}
+        os.makedirs(self.directory, exist_ok=True)
+        self._total_bytes = sum(size for _, size, _ in self._scan())
+
+    def _path(self, url: str) -> str:
+        digest = hashlib.sha256(canonical_url(url).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def _scan(self):
+        """Devuelve (ruta, tamaño, último uso) de cada entrada guardada."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """Devuelve la entrada guardada (fresca o no) o None si no existe."""
+        path = self._path(url)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            os.utime(path)  # marca de último uso para la política LRU
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Entrada de caché ilegible para {url}: {e}")
+            return None
+        return CacheEntry(**data)
+
+    def put(self, url: str, body: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        entry = CacheEntry(
+            url=canonical_url(url),
+            body=body,
+            etag=etag,
+            last_modified=last_modified,
+            fetched_at=time.time(),
+        )
+        self._write(entry)
+        self.record("stores")
+
+    def mark_revalidated(self, entry: CacheEntry) -> None:
+        """El servidor respondió 304: la entrada vuelve a ser fresca durante otro TTL."""
+        entry.fetched_at = time.time()
+        self._write(entry)
+
+    def _write(self, entry: CacheEntry) -> None:
+        path = self._path(entry.url)
+        payload = json.dumps(entry.__dict__, ensure_ascii=False).encode("utf-8")
+        # Escritura atómica: otro hilo nunca lee un fichero a medio escribir
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            with self._lock:
+                try:
+                    previous_size = os.path.getsize(path)
+                except FileNotFoundError:
+                    previous_size = 0
+                os.replace(tmp_path, path)
+                self._total_bytes += len(payload) - previous_size
+                if self._total_bytes > self.max_bytes:
+                    self._evict()
+        except OSError as e:
+            logger.warning(f"No se pudo guardar {entry.url} en la caché: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _evict(self) -> None:
+        """Borra las entradas menos usadas hasta quedar por debajo del 90% del máximo."""
+        target = int(self.max_bytes * 0.9)
+        entries = sorted(self._scan(), key=lambda e: e[2])
+        self._total_bytes = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if self._total_bytes <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self._total_bytes -= size
+            self._stats["evictions"] += 1
+
+    def record(self, event: str) -> None:
+        """Contabiliza un evento (hits, revalidated, misses...) para las métricas."""
+        with self._lock:
+            self._stats[event] += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "bytes": self._total_bytes, "max_bytes": self.max_bytes}
+
+
+_default_cache: Optional[HtmlCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_html_cache() -> Optional[HtmlCache]:
+    """Caché compartida por todos los scrapers, o None si está desactivada en la configuración."""
+    global _default_cache
+    if not SCRAPER_CACHE_ENABLED:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = HtmlCache(
+                directory=SCRAPER_CACHE_DIR,
+                ttl=SCRAPER_CACHE_TTL,
+                max_bytes=SCRAPER_CACHE_MAX_MB * 1024 * 1024,
+            )
+    return _default_cache
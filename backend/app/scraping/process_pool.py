@@ -0,0 +1,190 @@
+# scraping/process_pool.py
+
+import asyncio
+import importlib
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from decouple import config
+
+logger = logging.getLogger(__name__)
+
+# Pool de procesos para el trabajo de CPU (parseo HTML y transformación).
+# Desactivado por defecto: con él activo ese trabajo no compite por el GIL del proceso de la API.
+CPU_POOL_ENABLED = config("CPU_POOL_ENABLED", default=False, cast=bool)
+CPU_POOL_WORKERS = config("CPU_POOL_WORKERS", default=0, cast=int)  # procesos (0 = núcleos disponibles)
+
+# Módulos que cada proceso importa al arrancar, para no pagar su carga en la primera petición.
+# Importar los scrapers y transform_service crea además los matchers y transformadores una sola vez.
+_APP_PACKAGE = __name__.split(".")[0]
+PRELOAD_MODULES = (
+    "pandas",
+    "bs4",
+    "lxml",
+    f"{_APP_PACKAGE}.scraping.scraping_site_1",
+    f"{_APP_PACKAGE}.scraping.scraping_site_2",
+    f"{_APP_PACKAGE}.scraping.scraping_site_3",
+    f"{_APP_PACKAGE}.services.transform_service",
+)
+
+
+# --- Código que se ejecuta dentro de los procesos del pool ---
+
+# Scrapers de este proceso, por (clase, parser)
+_worker_scrapers: Dict[Tuple[type, str], Any] = {}
+
+
+def _init_worker(modules: Sequence[str]) -> None:
+    # Los scrapers creados dentro del worker parsean en su propio proceso, sin pool anidado
+    disable_default_cpu_pool()
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except ImportError as e:
+            logger.warning(f"Pool de CPU: no se pudo precargar '{module}': {e}")
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _timed(func: Callable, args: tuple, kwargs: dict) -> Tuple[Any, float, float]:
+    """Ejecuta func y devuelve (resultado, instante de inicio, duración) para las métricas de cola."""
+    started = time.time()
+    result = func(*args, **kwargs)
+    return result, started, time.time() - started
+
+
+def parse_html_task(scraper_cls: type, parser: str, html: str, args: tuple, kwargs: dict):
+    """scraper.parse_html en un proceso del pool. El scraper se crea una vez por proceso."""
+    key = (scraper_cls, parser)
+    scraper = _worker_scrapers.get(key)
+    if scraper is None:
+        scraper = _worker_scrapers[key] = scraper_cls(parser=parser)
+    return scraper.parse_html(html, *args, **kwargs)
+
+
+# --- Lado del proceso de la API ---
+
+class CpuPool:
+    """Pool de procesos pre-calentados para parseo y transformación.
+
+    Los procesos se crean con "spawn" e importan PRELOAD_MODULES al arrancar;
+    start() los lanza todos de antemano. Las tareas que no caben en los workers
+    esperan en la cola del executor: queue_depth y el tiempo de espera medio
+    indican si hacen falta más procesos.
+    """
+
+    def __init__(self, workers: int = 0, preload: Sequence[str] = PRELOAD_MODULES):
+        self.workers = workers or os.cpu_count() or 1
+        self.preload = tuple(preload)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._stats = {
+            "tasks": 0, "errors": 0, "restarts": 0, "max_queue_depth": 0,
+            "wait_s": 0.0, "run_s": 0.0, "wait_max_s": 0.0,
+        }
+
+    def start(self) -> ProcessPoolExecutor:
+        """Crea el pool y arranca todos los procesos (idempotente)."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.preload,),
+                )
+                # El executor crea los procesos bajo demanda: una tarea vacía por worker los lanza todos ya
+                for _ in range(self.workers):
+                    self._executor.submit(_ping)
+                logger.info(f"Pool de CPU iniciado con {self.workers} procesos")
+            return self._executor
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    @property
+    def queue_depth(self) -> int:
+        """Tareas enviadas que todavía no tienen un proceso libre."""
+        return max(self._in_flight - self.workers, 0)
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Ejecuta func(*args, **kwargs) en un proceso del pool. func y sus argumentos deben ser picklables."""
+        executor = self.start()
+        loop = asyncio.get_running_loop()
+        submitted = time.time()
+        self._in_flight += 1
+        self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], self.queue_depth)
+        try:
+            result, started, run_s = await loop.run_in_executor(executor, _timed, func, args, kwargs)
+        except BrokenProcessPool:
+            # Un proceso murió (p. ej. por memoria): el pool ya no sirve y se recrea en la siguiente tarea
+            self._stats["errors"] += 1
+            self._restart(executor)
+            raise
+        except BaseException:
+            self._stats["errors"] += 1
+            raise
+        finally:
+            self._in_flight -= 1
+        wait = max(started - submitted, 0.0)
+        self._stats["tasks"] += 1
+        self._stats["wait_s"] += wait
+        self._stats["run_s"] += run_s
+        self._stats["wait_max_s"] = max(self._stats["wait_max_s"], wait)
+        return result
+
+    def _restart(self, broken: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is not broken:
+                return
+            self._executor = None
+            self._stats["restarts"] += 1
+        logger.error("Pool de CPU roto (un proceso terminó de forma inesperada); se recreará")
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        tasks = self._stats["tasks"]
+        return {
+            "enabled": True,
+            "workers": self.workers,
+            "started": self._executor is not None,
+            "in_flight": self._in_flight,
+            "queue_depth": self.queue_depth,
+            **{key: round(value, 4) if isinstance(value, float) else value for key, value in self._stats.items()},
+            "wait_avg_s": round(self._stats["wait_s"] / tasks, 4) if tasks else 0.0,
+            "run_avg_s": round(self._stats["run_s"] / tasks, 4) if tasks else 0.0,
+        }
+
+
+_default_pool: Optional[CpuPool] = None
+_default_pool_lock = threading.Lock()
+_default_pool_disabled = False
+
+
+def get_default_cpu_pool() -> Optional[CpuPool]:
+    """Pool compartido para parseo y transformación, o None si está desactivado (se usan hilos)."""
+    global _default_pool
+    if not CPU_POOL_ENABLED or _default_pool_disabled:
+        return None
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = CpuPool(workers=CPU_POOL_WORKERS)
+    return _default_pool
+
+
+def disable_default_cpu_pool() -> None:
+    """Desactiva el pool en este proceso (p. ej. dentro de un proceso que ya es un worker)."""
+    global _default_pool_disabled
+    _default_pool_disabled = True
@@ -0,0 +1,160 @@
+# scraping/rate_limiter.py
+
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
+
+from decouple import config
+
+# Límites por host para las peticiones salientes (se pueden sobreescribir desde .env)
+SCRAPER_RATE_LIMIT_ENABLED = config("SCRAPER_RATE_LIMIT_ENABLED", default=True, cast=bool)
+SCRAPER_HOST_MAX_IN_FLIGHT = config("SCRAPER_HOST_MAX_IN_FLIGHT", default=4, cast=int)  # peticiones simultáneas
+SCRAPER_HOST_RPS = config("SCRAPER_HOST_RPS", default=2.0, cast=float)                  # peticiones por segundo (0 = sin límite)
+SCRAPER_HOST_BURST = config("SCRAPER_HOST_BURST", default=4, cast=int)                  # ráfaga permitida
+
+
+class TokenBucket:
+    """Cubo de tokens: permite `burst` peticiones seguidas y después `rate` por segundo.
+
+    reserve() reserva un token aunque todavía no haya (el saldo puede quedar
+    negativo) y devuelve cuánto hay que esperar. Así los que llegan antes salen antes.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    def reserve(self) -> float:
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        return max(0.0, -self._tokens / self.rate)
+
+
+class _HostState:
+    def __init__(self, max_in_flight: int, rate: float, burst: int):
+        self.max_in_flight = max_in_flight
+        self.bucket = TokenBucket(rate, burst)
+        self.semaphore: Optional[asyncio.Semaphore] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats = {
+            "requests": 0,
+            "in_flight": 0,
+            "waiting": 0,
+            "wait_concurrency_s": 0.0,
+            "wait_rate_s": 0.0,
+            "wait_max_s": 0.0,
+        }
+
+    def get_semaphore(self) -> asyncio.Semaphore:
+        # Los semáforos de asyncio quedan ligados a un event loop: si cambia
+        # (p. ej. varias llamadas a asyncio.run) se crea uno nuevo.
+        loop = asyncio.get_running_loop()
+        if self.semaphore is None or self.loop is not loop:
+            self.semaphore = asyncio.Semaphore(self.max_in_flight)
+            self.loop = loop
+        return self.semaphore
+
+
+class HostLimiter:
+    """Limita las peticiones salientes por host: máximo en vuelo y peticiones por segundo.
+
+    Uso:
+        async with limiter.limit("www.auto-data.net"):
+            response = await client.get(url)
+
+    El tiempo de espera (por concurrencia y por ritmo) queda en stats() para
+    poder dimensionar los límites.
+    """
+
+    def __init__(self, max_in_flight: int, rate: float, burst: int):
+        self.max_in_flight = max_in_flight
+        self.rate = rate
+        self.burst = burst
+        self._hosts: Dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, host: str, max_in_flight: Optional[int] = None,
+                  rate: Optional[float] = None, burst: Optional[int] = None) -> None:
+        """Fija límites propios para un host concreto."""
+        with self._lock:
+            self._hosts[host.lower()] = _HostState(
+                max_in_flight or self.max_in_flight,
+                self.rate if rate is None else rate,
+                burst or self.burst,
+            )
+
+    def _state(self, host: str) -> _HostState:
+        host = host.lower()
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = self._hosts[host] = _HostState(self.max_in_flight, self.rate, self.burst)
+            return state
+
+    @asynccontextmanager
+    async def limit(self, host: str):
+        state = self._state(host)
+        stats = state.stats
+        stats["waiting"] += 1
+        start = time.monotonic()
+        semaphore = state.get_semaphore()
+        try:
+            await semaphore.acquire()
+        finally:
+            stats["waiting"] -= 1
+        try:
+            acquired = time.monotonic()
+            delay = state.bucket.reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            waited = time.monotonic() - start
+            stats["wait_concurrency_s"] += acquired - start
+            stats["wait_rate_s"] += waited - (acquired - start)
+            stats["wait_max_s"] = max(stats["wait_max_s"], waited)
+            stats["requests"] += 1
+            stats["in_flight"] += 1
+            try:
+                yield
+            finally:
+                stats["in_flight"] -= 1
+        finally:
+            semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hosts = dict(self._hosts)
+        result = {}
+        for host, state in hosts.items():
+            stats = dict(state.stats)
+            total_wait = stats["wait_concurrency_s"] + stats["wait_rate_s"]
+            stats["wait_avg_s"] = total_wait / stats["requests"] if stats["requests"] else 0.0
+            stats.update(max_in_flight=state.max_in_flight, rate=state.bucket.rate, burst=state.bucket.burst)
+            result[host] = stats
+        return result
+
+
+_default_limiter: Optional[HostLimiter] = None
+_default_limiter_lock = threading.Lock()
+
+
+def get_default_host_limiter() -> Optional[HostLimiter]:
+    """Limitador compartido por todos los scrapers, o None si está desactivado."""
+    global _default_limiter
+    if not SCRAPER_RATE_LIMIT_ENABLED:
+        return None
+    with _default_limiter_lock:
+        if _default_limiter is None:
+            _default_limiter = HostLimiter(
+                max_in_flight=SCRAPER_HOST_MAX_IN_FLIGHT,
+                rate=SCRAPER_HOST_RPS,
+                burst=SCRAPER_HOST_BURST,
+            )
+    return _default_limiter
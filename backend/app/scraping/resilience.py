@@ -0,0 +1,126 @@
+# scraping/resilience.py
+
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from decouple import config
+
+from .errors import CircuitOpenError, FetchError, FetchHTTPError
+
+# Reintentos y circuit breaker (se pueden sobreescribir desde .env)
+SCRAPER_RETRIES = config("SCRAPER_RETRIES", default=2, cast=int)                      # reintentos además del primer intento
+SCRAPER_RETRY_BASE_DELAY = config("SCRAPER_RETRY_BASE_DELAY", default=0.5, cast=float)  # segundos
+SCRAPER_RETRY_MAX_DELAY = config("SCRAPER_RETRY_MAX_DELAY", default=4.0, cast=float)    # segundos
+SCRAPER_BREAKER_THRESHOLD = config("SCRAPER_BREAKER_THRESHOLD", default=5, cast=int)    # fallos seguidos para abrir
+SCRAPER_BREAKER_RESET = config("SCRAPER_BREAKER_RESET", default=30.0, cast=float)       # segundos abierto
+
+
+class RetryPolicy:
+    """Reintentos acotados con backoff exponencial y jitter completo.
+
+    La espera de cada reintento es aleatoria entre 0 y min(max_delay, base_delay * 2^intento),
+    para que varias peticiones que fallan a la vez no reintenten todas al mismo tiempo.
+    """
+
+    def __init__(self, retries: int = SCRAPER_RETRIES, base_delay: float = SCRAPER_RETRY_BASE_DELAY,
+                 max_delay: float = SCRAPER_RETRY_MAX_DELAY):
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def should_retry(self, error: Exception, attempt: int) -> bool:
+        return isinstance(error, FetchError) and error.transient and attempt < self.retries
+
+    def delay(self, error: Exception, attempt: int) -> float:
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        # Si el servidor indica Retry-After se respeta, sin pasar del máximo
+        if isinstance(error, FetchHTTPError) and error.retry_after:
+            delay = max(delay, min(error.retry_after, self.max_delay))
+        return delay
+
+
+class CircuitBreaker:
+    """Circuit breaker por sitio.
+
+    - Cerrado: las peticiones pasan; se cuentan los fallos transitorios seguidos.
+    - Abierto (tras `threshold` fallos): se rechaza al instante con CircuitOpenError
+      durante `reset_timeout` segundos, sin esperar al timeout de red.
+    - Semiabierto: pasado ese tiempo se deja pasar una petición de prueba; si
+      funciona se cierra y si falla vuelve a abrirse. Si termina sin resultado
+      (plazo agotado, cancelación, error ajeno a la red) se libera con release_probe
+      y la siguiente petición vuelve a probar.
+    """
+
+    def __init__(self, name: str, threshold: int = SCRAPER_BREAKER_THRESHOLD,
+                 reset_timeout: float = SCRAPER_BREAKER_RESET):
+        self.name = name
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe: Optional[object] = None
+        self._stats = {"rejected": 0, "opened": 0}
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def before_request(self, url: str) -> Optional[object]:
+        """Lanza CircuitOpenError si el sitio está marcado como caído.
+
+        Si la petición es la de prueba del estado semiabierto devuelve su testigo,
+        que hay que pasar a release_probe al terminar; si no, None.
+        """
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return None
+            if state == "half_open" and self._probe is None:
+                self._probe = object()
+                return self._probe
+            self._stats["rejected"] += 1
+            retry_in = max(self.reset_timeout - (time.monotonic() - self._opened_at), 0)
+            raise CircuitOpenError(url, retry_in)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probe = None
+
+    def record_failure(self, error: Exception) -> None:
+        # Solo cuentan los fallos que indican que el sitio está caído (no un 404)
+        if not (isinstance(error, FetchError) and error.transient):
+            self.record_success()
+            return
+        with self._lock:
+            self._failures += 1
+            probing = self._probe is not None
+            if probing or self._failures >= self.threshold:
+                if self._opened_at is None or probing:
+                    self._stats["opened"] += 1
+                self._opened_at = time.monotonic()
+                self._probe = None
+
+    def release_probe(self, probe: Optional[object]) -> None:
+        """Libera la petición de prueba si terminó sin registrar resultado.
+
+        El circuito sigue semiabierto (no se toca _opened_at): la siguiente petición
+        hace de prueba. No hace nada si probe es None o ya se registró el resultado.
+        """
+        if probe is None:
+            return
+        with self._lock:
+            if self._probe is probe:
+                self._probe = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "state": self.state, "consecutive_failures": self._failures}
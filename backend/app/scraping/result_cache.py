@@ -0,0 +1,79 @@
+# scraping/result_cache.py
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+import pandas as pd
+from decouple import config
+
+# Configuración de la caché de resultados parseados (se puede sobreescribir desde .env)
+SCRAPER_RESULT_CACHE_ENABLED = config("SCRAPER_RESULT_CACHE_ENABLED", default=True, cast=bool)
+SCRAPER_RESULT_CACHE_SIZE = config("SCRAPER_RESULT_CACHE_SIZE", default=256, cast=int)   # entradas
+SCRAPER_RESULT_CACHE_TTL = config("SCRAPER_RESULT_CACHE_TTL", default=3600, cast=int)    # segundos
+
+
+class ResultCache:
+    """Caché en memoria, acotada y con TTL, de los DataFrames (Key, Value) ya parseados.
+
+    Al superar max_entries se descarta la entrada usada hace más tiempo (LRU).
+    Se guardan y devuelven copias para que quien llama pueda modificar el DataFrame.
+    """
+
+    def __init__(self, max_entries: int, ttl: int):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0}
+
+    def get(self, key: Hashable) -> Optional[pd.DataFrame]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                self._stats["misses"] += 1
+                return None
+            stored_at, df = item
+            if time.monotonic() - stored_at >= self.ttl:
+                del self._entries[key]
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+        return df.copy()
+
+    def put(self, key: Hashable, df: pd.DataFrame) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), df.copy())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries), "max_entries": self.max_entries}
+
+
+_default_cache: Optional[ResultCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_result_cache() -> Optional[ResultCache]:
+    """Caché de resultados compartida por todos los scrapers, o None si está desactivada."""
+    global _default_cache
+    if not SCRAPER_RESULT_CACHE_ENABLED:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResultCache(
+                max_entries=SCRAPER_RESULT_CACHE_SIZE,
+                ttl=SCRAPER_RESULT_CACHE_TTL,
+            )
+    return _default_cache
@@ -1,9 +1,12 @@
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, class_token
 import pandas as pd
+from bs4 import SoupStrainer
 
 class Site1Scraper(BaseScraper):
-    def scrape(self, url):
-        soup = self.fetch_page(url)
+    # Todos los datos están dentro de <article class="container">
+    parse_only = SoupStrainer('article', class_=class_token('container'))
+
+    def parse(self, soup):
         data = []
         # Lógica específica para pagina holandesa
         sections = soup.find_all('article', class_='container')
@@ -1,14 +1,18 @@
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, class_token
 import pandas as pd
-from typing import List, Dict, Tuple
-from bs4 import BeautifulSoup
+from typing import List, Dict, Optional, Pattern, Tuple
+from bs4 import BeautifulSoup, SoupStrainer
+from .dom_index import DomIndex
 import re
 import html 
 
 
 class Site2Scraper(BaseScraper):
-    def __init__(self):
-        super().__init__()
+    # Los datos del COC están en los bloques "cocRow"
+    parse_only = SoupStrainer(class_=class_token('cocRow'))
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
         self.search_configs = [
             {
                 'container_class': 'col-sm-7 cocInfo',
@@ -38,51 +42,63 @@ class Site2Scraper(BaseScraper):
                 'element_type': 'label'
             }
         ]
+        # Los identificadores de cada configuración se compilan una sola vez (en el mismo orden que search_configs)
+        self._config_matchers = [self.compile_identifiers(config['identifiers']) for config in self.search_configs]
 #            <div class="col-sm-5 cocInfo">16 Final drive</div><div class="col-sm-7">Front wheel </div>
 
-    def extract_data_by_config(self, soup: BeautifulSoup, config: Dict) -> List[Tuple[str, str]]:
-        """Extrae datos según la configuración proporcionada."""
+    @staticmethod
+    def compile_identifiers(identifiers: List[str]) -> Pattern:
+        """Compila una lista de identificadores en una única expresión regular (alternancia):
+        un solo recorrido del texto en lugar de buscar cada identificador por separado."""
+        return re.compile("|".join(re.escape(identifier) for identifier in identifiers))
+
+    def extract_data_by_config(self, index: DomIndex, config: Dict, matcher: Optional[Pattern] = None) -> List[Tuple[str, str]]:
+        """Extrae datos según la configuración proporcionada.
+
+        matcher es la expresión ya compilada de config['identifiers']; si no se pasa, se compila aquí.
+        """
         data = []
         element_type = config.get('element_type', 'div')
-        elements = soup.find_all(element_type, class_=config['container_class'])
+        matcher = matcher or self.compile_identifiers(config['identifiers'])
+        elements = index.find_all(element_type, config['container_class'])
 
         for element in elements:
             text = element.get_text(strip=True)
-            if any(identifier in text for identifier in config['identifiers']):
-                value_element = element.find_next(element_type, class_=config['value_class'])
+            if matcher.search(text):
+                value_element = index.find_next(element, element_type, config['value_class'])
                 if value_element:
                     value = value_element.get_text(strip=True)
                     data.append((text, value))
         return data
 
-    def extract_axle_guarantees(self, soup: BeautifulSoup) -> List[Tuple[str, str]]:
+    def extract_axle_guarantees(self, index: DomIndex) -> List[Tuple[str, str]]:
         """Extrae específicamente las garantías de ejes."""
         data = []
-        main_element = soup.find('div', class_='col-sm-6 cocInfo', string='54 Axle guarantees')
+        main_element = index.find('div', 'col-sm-6 cocInfo', string='54 Axle guarantees')
 
         if main_element:
             # Extraer garantía delantera (v.)
-            v_element = main_element.find_next('div', class_='col-sm-1 cocInfo', string='v.')
+            v_element = index.find_next(main_element, 'div', 'col-sm-1 cocInfo', string='v.')
             if v_element:
-                value_v = v_element.find_next('div', class_='col-sm-5')
+                value_v = index.find_next(v_element, 'div', 'col-sm-5')
                 if value_v:
                     data.append((f"54 Axle guarantees v.", value_v.get_text(strip=True)))
 
             # Extraer garantía trasera (b.)
-            b_element = main_element.find_next('div', class_='offset-sm-6 col-sm-1 cocInfo', string='b.')
+            b_element = index.find_next(main_element, 'div', 'offset-sm-6 col-sm-1 cocInfo', string='b.')
             if b_element:
-                value_b = b_element.find_next('div', class_='col-sm-5')
+                value_b = index.find_next(b_element, 'div', 'col-sm-5')
                 if value_b:
                     data.append((f"54 Axle guarantees b.", value_b.get_text(strip=True)))
 
         return data
 
-    def extract_tow_remarks(self, soup: BeautifulSoup) -> List[Tuple[str, str]]:
+    def extract_tow_remarks(self, index: DomIndex) -> List[Tuple[str, str]]:
         """Extrae todo el texto que contiene Remarks y lo separa por secciones numeradas."""
         data = []
 
         # 1. Encontrar el header "Remarks"
-        remarks_header = soup.find('div', string='Remarks')
+        remarks_header = index.find('div', string='Remarks')
         if not remarks_header:
             return data
 
@@ -107,23 +123,23 @@ class Site2Scraper(BaseScraper):
 
         return data
 
-    def extract_vmax_info(self, soup: BeautifulSoup) -> List[Tuple[str, str]]:
+    def extract_vmax_info(self, index: DomIndex) -> List[Tuple[str, str]]:
       """Extrae información de VMax mecánica y automática y las combina en un solo valor."""
       data = []
 
       # Buscar el elemento que contiene "19 Vehicle VMax mech."
-      vmax_element = soup.find('div', class_='col-sm-6 cocInfo', string=lambda s: '19 Vehicle VMax mech.' in s if s else False)
+      vmax_element = index.find('div', 'col-sm-6 cocInfo', string=lambda s: '19 Vehicle VMax mech.' in s if s else False)
 
       if vmax_element:
           # Extraer valor mecánico
-          mech_value_element = vmax_element.find_next('div', class_='col-sm-1 no-gutters')
+          mech_value_element = index.find_next(vmax_element, 'div', 'col-sm-1 no-gutters')
           mech_value = mech_value_element.get_text(strip=True) if mech_value_element else ""
 
           # Extraer valor automático
-          autom_label_element = vmax_element.find_next('div', class_='col-sm-2 cocInfo', string=lambda s: 'autom.' in s if s else False)
+          autom_label_element = index.find_next(vmax_element, 'div', 'col-sm-2 cocInfo', string=lambda s: 'autom.' in s if s else False)
           autom_value = ""
           if autom_label_element:
-              autom_value_element = autom_label_element.find_next('div', class_='col-sm-3')
+              autom_value_element = index.find_next(autom_label_element, 'div', 'col-sm-3')
               autom_value = autom_value_element.get_text(strip=True) if autom_value_element else ""
 
           # Crear un valor combinado simple
@@ -135,7 +151,7 @@ class Site2Scraper(BaseScraper):
 
 
 
-    def extract_emissions_data(self, soup: BeautifulSoup) -> List[Tuple[str, str]]:
+    def extract_emissions_data(self, index: DomIndex) -> List[Tuple[str, str]]:
         """Extrae información de emisiones usando hermanos directos para separar encabezados y datos.
 
         Se asume que dentro de un bloque (div.row.cocRow):
@@ -146,7 +162,7 @@ class Site2Scraper(BaseScraper):
         """
         data = []
         # Buscar el elemento con el título "72 Emissions"
-        emissions_header = soup.find('div', string='72 Emissions')
+        emissions_header = index.find('div', string='72 Emissions')
         if emissions_header:
             # Obtener el contenedor (la fila completa)
             block = emissions_header.find_parent("div", class_="row cocRow")
@@ -180,7 +196,7 @@ class Site2Scraper(BaseScraper):
 
 
 
-    def extract_transmission_info(self, soup: BeautifulSoup, transmissionManual: bool = None) -> List[Tuple[str, str]]:
+    def extract_transmission_info(self, index: DomIndex, transmissionManual: bool = None) -> List[Tuple[str, str]]:
       """Extrae la información de '18 Transmission/IA' según la opción indicada por transmissionManual.
 
       Si transmissionManual es True, se extrae el primer bloque (por ejemplo, la opción manual).
@@ -189,18 +205,18 @@ class Site2Scraper(BaseScraper):
       """
       data = []
       # Buscar el encabezado "18 Transmission/IA"
-      transmission_header = soup.find('div', class_='col-sm-5 cocInfo', string=lambda s: s and '18 Transmission/IA' in s)
+      transmission_header = index.find('div', 'col-sm-5 cocInfo', string=lambda s: s and '18 Transmission/IA' in s)
 
       if transmission_header:
           # Extraer el primer bloque de datos
-          first_data_div = transmission_header.find_next('div', class_='col-sm-7')
+          first_data_div = index.find_next(transmission_header, 'div', 'col-sm-7')
           first_value = first_data_div.get_text(strip=True) if first_data_div else ""
 
           # Buscar el siguiente bloque de datos asociado (por ejemplo, en la sección "Assignment")
-          assignment_header = first_data_div.find_next('div', class_='col-sm-5 cocInfo', string=lambda s: s and 'Assignment' in s)
+          assignment_header = index.find_next(first_data_div, 'div', 'col-sm-5 cocInfo', string=lambda s: s and 'Assignment' in s)
           second_value = ""
           if assignment_header:
-              second_data_div = assignment_header.find_next('div', class_='col-sm-7')
+              second_data_div = index.find_next(assignment_header, 'div', 'col-sm-7')
               second_value = second_data_div.get_text(strip=True) if second_data_div else ""
 
           # Decidir cuál valor extraer según transmissionManual
@@ -218,21 +234,22 @@ class Site2Scraper(BaseScraper):
 
 
 
-    def scrape(self, url: str, transmissionManual: bool = None) -> pd.DataFrame:
-      """Método principal para realizar el scraping, con opción de especificar la transmisión."""
-      soup = self.fetch_page(url)
+    def parse(self, soup: BeautifulSoup, transmissionManual: bool = None) -> pd.DataFrame:
+      """Método principal que extrae los datos de la página, con opción de especificar la transmisión."""
       all_data = []
+      # Un único recorrido del documento; todas las búsquedas se resuelven sobre el índice
+      index = DomIndex(soup)
 
       # Extraer datos según las configuraciones existentes
-      for config in self.search_configs:
-          all_data.extend(self.extract_data_by_config(soup, config))
+      for config, matcher in zip(self.search_configs, self._config_matchers):
+          all_data.extend(self.extract_data_by_config(index, config, matcher))
 
-      all_data.extend(self.extract_axle_guarantees(soup))
-      all_data.extend(self.extract_tow_remarks(soup))
-      all_data.extend(self.extract_vmax_info(soup))
-      all_data.extend(self.extract_emissions_data(soup))
+      all_data.extend(self.extract_axle_guarantees(index))
+      all_data.extend(self.extract_tow_remarks(index))
+      all_data.extend(self.extract_vmax_info(index))
+      all_data.extend(self.extract_emissions_data(index))
 
       # Extraer información de Transmission/IA con la opción indicada
-      all_data.extend(self.extract_transmission_info(soup, transmissionManual))
+      all_data.extend(self.extract_transmission_info(index, transmissionManual))
 
       return pd.DataFrame(all_data, columns=['Key', 'Value'])
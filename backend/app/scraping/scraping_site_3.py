@@ -1,42 +1,64 @@
 # scraping/scraping_site_3.py
 
 import pandas as pd
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 # Importa la clase base desde el mismo directorio
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, class_token
+from .errors import FetchError
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    # selectolax es opcional: sin él, Site3 usa BeautifulSoup como los demás scrapers
+    LexborHTMLParser = None
 
 class Site3Scraper(BaseScraper):
     """
     Scraper específico para extraer datos de especificaciones de vehículos
     del sitio auto-data.net.
     """
-    def scrape(self, url: str) -> pd.DataFrame:
+    # Con BeautifulSoup solo se construye la tabla de especificaciones
+    parse_only = SoupStrainer('table', class_=class_token('cardetailsout'))
+
+    # Mapeo de los textos de encabezado (th) en el HTML a los nombres de clave deseados
+    KEY_MAPPING = {
+        "Power steering": "Steering, method of assistance",
+        "Body type": "Type of body",
+        "Doors": "Number and configuration of doors",
+        "Seats": "Number and position of seats",
+        "Front suspension": "Front suspension",
+        "Rear suspension": "Rear suspension",
+        "Front brakes": "Front brakes",
+        "Rear brakes": "Rear brakes",
+        "Assisting systems": "Assisting systems",
+        "Powertrain Architecture" : "Powertrain architecture",
+    }
+
+    def on_fetch_error(self, url: str, error: Exception) -> pd.DataFrame:
         """
-        Realiza el scraping de la URL dada y devuelve un DataFrame con los datos extraídos.
+        Los errores de descarga (FetchError: plazo agotado, circuito abierto, HTTP,
+        conexión, reintentos agotados) se propagan para que scrape_site informe del
+        estado del sitio. Ante cualquier otro error retorna un DataFrame vacío.
         """
-        print(f"Iniciando scraping para el Sitio 3: {url}") # Mensaje informativo
-        try:
-            # Usa el método fetch_page de la clase base para obtener el soup
-            soup = self.fetch_page(url)
-        except Exception as e:
-            # Si fetch_page falla, retorna un DataFrame vacío o maneja el error como prefieras
-            print(f"Error al obtener la página para el Sitio 3 ({url}): {e}")
-            return pd.DataFrame(columns=["Key", "Value"])
-
-        # Mapeo de los textos de encabezado (th) en el HTML a los nombres de clave deseados
-        key_mapping = {
-            "Power steering": "Steering, method of assistance",
-            "Body type": "Type of body",
-            "Doors": "Number and configuration of doors",
-            "Seats": "Number and position of seats",
-            "Front suspension": "Front suspension",
-            "Rear suspension": "Rear suspension",
-            "Front brakes": "Front brakes",
-            "Rear brakes": "Rear brakes",
-            "Assisting systems": "Assisting systems",
-            "Powertrain Architecture" : "Powertrain architecture",
-        }
+        if isinstance(error, FetchError):
+            raise error
+        print(f"Error al obtener la página para el Sitio 3 ({url}): {error}")
+        return pd.DataFrame(columns=["Key", "Value"])
 
+    def parse_html(self, html: str) -> pd.DataFrame:
+        """
+        Con parser "selectolax" (SCRAPER_HTML_PARSER) la tabla de auto-data.net, que es
+        simple, se recorre con lexbor, sin construir un árbol de BeautifulSoup.
+        Si selectolax no está instalado se usa la ruta normal.
+        """
+        if self.parser == "selectolax" and LexborHTMLParser is not None:
+            return self.parse_lexbor(LexborHTMLParser(html))
+        return super().parse_html(html)
+
+    def parse(self, soup: BeautifulSoup) -> pd.DataFrame:
+        """
+        Extrae los datos de la tabla de especificaciones de auto-data.net.
+        """
         extracted_data = []
 
         # Encontrar la tabla principal de detalles
@@ -53,8 +75,8 @@ class Site3Scraper(BaseScraper):
                     header_text = header.get_text(strip=True)
 
                     # Verificar si el texto del encabezado está en nuestro mapeo
-                    if header_text in key_mapping:
-                        target_key = key_mapping[header_text]
+                    if header_text in self.KEY_MAPPING:
+                        target_key = self.KEY_MAPPING[header_text]
 
                         # Extraer el texto del td, limpiando posibles <br> y espacios extra
                         if header_text == "Assisting systems":
@@ -68,8 +90,47 @@ class Site3Scraper(BaseScraper):
         else:
             print("Advertencia: No se encontró la tabla 'cardetailsout car2' en el Sitio 3.")
 
+        return self._to_dataframe(extracted_data)
+
+    def parse_lexbor(self, tree) -> pd.DataFrame:
+        """
+        Misma extracción que parse, sobre el árbol de selectolax/lexbor.
+        """
+        extracted_data = []
+
+        details_table = tree.css_first('table.cardetailsout.car2')
+
+        if details_table:
+            for row in details_table.css('tr'):
+                header = row.css_first('th')
+                data_cell = row.css_first('td')
+
+                if header and data_cell:
+                    header_text = header.text(strip=True)
+
+                    if header_text in self.KEY_MAPPING:
+                        target_key = self.KEY_MAPPING[header_text]
+
+                        if header_text == "Assisting systems":
+                            # Primer nodo de texto directo del td (equivalente a find(string=True, recursive=False))
+                            value_text = next(
+                                (node.text_content for node in data_cell.iter(include_text=True) if node.tag == "-text"),
+                                None
+                            )
+                            value_text = value_text.strip() if value_text else data_cell.text(strip=True)
+                        else:
+                            value_text = data_cell.text(strip=True)
+
+                        extracted_data.append((target_key, value_text))
+        else:
+            print("Advertencia: No se encontró la tabla 'cardetailsout car2' en el Sitio 3.")
+
+        return self._to_dataframe(extracted_data)
+
+    @staticmethod
+    def _to_dataframe(extracted_data) -> pd.DataFrame:
         # Convertir la lista de tuplas a un DataFrame de Pandas
         if not extracted_data:
              print("Advertencia: No se extrajeron datos del Sitio 3.")
 
-        return pd.DataFrame(extracted_data, columns=["Key", "Value"])
\ No newline at end of file
+        return pd.DataFrame(extracted_data, columns=["Key", "Value"])
@@ -0,0 +1,210 @@
+# backend/app/services/batch_service.py
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+from decouple import config
+
+from ..scraping.executors import cpu_executor
+from .pipeline import merge_site_results, process_sites
+
+logger = logging.getLogger(__name__)
+
+# Configuración de los lotes (se puede sobreescribir desde .env)
+BATCH_CONCURRENCY = config("BATCH_CONCURRENCY", default=3, cast=int)        # vehículos en paralelo (todos los lotes)
+BATCH_MAX_ITEMS = config("BATCH_MAX_ITEMS", default=100, cast=int)          # vehículos por lote
+BATCH_MAX_JOBS = config("BATCH_MAX_JOBS", default=50, cast=int)             # lotes terminados que se conservan
+BATCH_ITEM_DEADLINE = config("BATCH_ITEM_DEADLINE", default=30.0, cast=float)  # segundos por vehículo
+
+
+@dataclass
+class BatchItem:
+    """Un vehículo del lote (tres URLs + opción de transmisión)."""
+    index: int
+    url1: Optional[str]
+    url2: Optional[str]
+    url3: Optional[str]
+    transmission_manual: Optional[bool] = None
+    status: str = "pending"  # pending, running, done, failed, cancelled
+    site_status: Dict[str, str] = field(default_factory=dict)
+    error: Optional[str] = None
+    result: Optional[pd.DataFrame] = None
+    elapsed: Optional[float] = None
+
+
+@dataclass
+class BatchJob:
+    id: str
+    owner_id: str
+    items: List[BatchItem]
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    _subscribers: List[asyncio.Queue] = field(default_factory=list, init=False, repr=False)
+
+    @property
+    def status(self) -> str:
+        """queued, running, finished o cancelled."""
+        counts = self.counts()
+        started = counts["done"] or counts["failed"]
+        if counts["running"] or (counts["pending"] and started):
+            return "running"
+        if counts["pending"]:
+            return "queued"
+        if counts["cancelled"]:
+            return "cancelled"
+        return "finished"
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("finished", "cancelled")
+
+    def counts(self) -> Dict[str, int]:
+        counts = {"pending": 0, "running": 0, "done": 0, "failed": 0, "cancelled": 0}
+        for item in self.items:
+            counts[item.status] += 1
+        return counts
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "total": len(self.items),
+            **self.counts(),
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+    def subscribe(self) -> asyncio.Queue:
+        """Cola con los índices de los vehículos que van terminando (None = lote terminado)."""
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
+
+    def _notify(self, item: Optional[BatchItem]) -> None:
+        for queue in self._subscribers:
+            queue.put_nowait(item.index if item is not None else None)
+
+
+class BatchQueue:
+    """Cola de lotes en memoria procesada por un número fijo de workers.
+
+    Los vehículos de todos los lotes comparten la misma cola FIFO y como mucho
+    `concurrency` se procesan a la vez, para no saturar los sitios de origen.
+    Los lotes terminados se conservan (los `max_jobs` más recientes) para poder consultarlos.
+    """
+
+    def __init__(self, concurrency: int = BATCH_CONCURRENCY, max_jobs: int = BATCH_MAX_JOBS,
+                 item_deadline: float = BATCH_ITEM_DEADLINE):
+        self.concurrency = concurrency
+        self.max_jobs = max_jobs
+        self.item_deadline = item_deadline
+        self._jobs: "OrderedDict[str, BatchJob]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        """Arranca los workers en el event loop actual (idempotente)."""
+        if self._workers and not all(worker.done() for worker in self._workers):
+            return
+        self._queue = asyncio.Queue()
+        self._workers = [asyncio.create_task(self._worker(i)) for i in range(self.concurrency)]
+        # Lotes que quedaran a medias si los workers se habían parado
+        for job in self._jobs.values():
+            for item in job.items:
+                if item.status == "pending":
+                    self._queue.put_nowait((job, item))
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(self, owner_id: str, items: List[Dict[str, Any]]) -> BatchJob:
+        self.start()
+        job = BatchJob(
+            id=str(uuid.uuid4()),
+            owner_id=owner_id,
+            items=[BatchItem(index=i, **item) for i, item in enumerate(items)],
+        )
+        self._jobs[job.id] = job
+        self._prune()
+        for item in job.items:
+            self._queue.put_nowait((job, item))
+        logger.info(f"Lote {job.id} encolado con {len(job.items)} vehículos")
+        return job
+
+    def get(self, job_id: str, owner_id: str) -> Optional[BatchJob]:
+        """Devuelve el lote solo si pertenece al usuario."""
+        job = self._jobs.get(job_id)
+        if job is None or job.owner_id != owner_id:
+            return None
+        return job
+
+    def cancel(self, job: BatchJob) -> None:
+        """Cancela los vehículos que aún no han empezado."""
+        for item in job.items:
+            if item.status == "pending":
+                item.status = "cancelled"
+                job._notify(item)
+        self._maybe_finish(job)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "jobs": len(self._jobs),
+            "running_jobs": sum(1 for job in self._jobs.values() if not job.finished),
+        }
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(len(finished) - self.max_jobs, 0)]:
+            del self._jobs[job_id]
+
+    def _maybe_finish(self, job: BatchJob) -> None:
+        if job.finished and job.finished_at is None:
+            job.finished_at = time.time()
+            logger.info(f"Lote {job.id} terminado: {job.counts()}")
+            job._notify(None)
+
+    async def _worker(self, number: int) -> None:
+        while True:
+            job, item = await self._queue.get()
+            try:
+                if item.status == "pending":
+                    await self._process(job, item)
+            except Exception as e:
+                logger.error(f"Error inesperado en el lote {job.id}, vehículo {item.index}: {e}", exc_info=True)
+                item.status, item.error = "failed", str(e)
+            finally:
+                self._queue.task_done()
+            if item.status in ("done", "failed"):
+                job._notify(item)
+                self._maybe_finish(job)
+
+    async def _process(self, job: BatchJob, item: BatchItem) -> None:
+        item.status = "running"
+        start = time.monotonic()
+        site_results = await process_sites(
+            item.url1, item.url2, item.url3, item.transmission_manual, deadline=self.item_deadline
+        )
+        item.site_status = {site: result.status for site, result in site_results.items()}
+        if not any(result.df is not None for result in site_results.values()):
+            item.status, item.error = "failed", "No se pudo obtener datos de ninguna URL proporcionada."
+        else:
+            item.result = await cpu_executor.run(merge_site_results, site_results)
+            item.status = "done"
+        item.elapsed = time.monotonic() - start
+
+
+batch_queue = BatchQueue()
@@ -0,0 +1,177 @@
+# backend/app/services/bulk_import_service.py
+import asyncio
+import io
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Union
+
+import pandas as pd
+from decouple import config
+
+from ..data_transformation.master_keys import MASTER_ORDERED_KEYS
+from ..scraping.process_pool import disable_default_cpu_pool
+from .pipeline import merge_site_results, process_sites, transmission_manual_from_option
+
+logger = logging.getLogger(__name__)
+
+BULK_IMPORT_WORKERS = config("BULK_IMPORT_WORKERS", default=2, cast=int)             # procesos
+BULK_IMPORT_DEADLINE = config("BULK_IMPORT_DEADLINE", default=60.0, cast=float)      # segundos por vehículo
+
+URL_COLUMNS = ["url1", "url2", "url3"]
+OUTPUT_FORMATS = ("xlsx", "csv")
+
+
+class BulkImportError(ValueError):
+    """El fichero de entrada no tiene el formato esperado."""
+
+
+def read_vehicle_rows(source: Union[str, BinaryIO], filename: str) -> List[Dict[str, Any]]:
+    """Lee un CSV o XLSX con columnas url1, url2, url3 y (opcional) transmission_option.
+
+    Devuelve una lista de dicts con esas claves; las celdas vacías quedan como None
+    y se descartan las filas sin ninguna URL.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    try:
+        if extension in (".xlsx", ".xlsm"):
+            df = pd.read_excel(source, dtype=str)
+        elif extension == ".csv":
+            # sep=None detecta "," o ";" (Excel en español exporta con ";")
+            df = pd.read_csv(source, dtype=str, sep=None, engine="python")
+        else:
+            raise BulkImportError(f"Formato no soportado: '{extension}'. Use .csv o .xlsx.")
+    except BulkImportError:
+        raise
+    except Exception as e:
+        raise BulkImportError(f"No se pudo leer el fichero: {e}")
+
+    df.columns = [str(column).strip().lower() for column in df.columns]
+    if not any(column in df.columns for column in URL_COLUMNS):
+        raise BulkImportError("El fichero debe tener al menos una de las columnas url1, url2, url3.")
+
+    rows = []
+    for record in df.reindex(columns=URL_COLUMNS + ["transmission_option"]).to_dict("records"):
+        record = {key: _clean_cell(value) for key, value in record.items()}
+        if not any(record[column] for column in URL_COLUMNS):
+            continue
+        record["transmission_option"] = record["transmission_option"] or "Por defecto"
+        rows.append(record)
+    return rows
+
+
+def _clean_cell(value: Any) -> Optional[str]:
+    """Texto sin espacios de los extremos; celdas vacías (o NaN) como None."""
+    if not isinstance(value, str):
+        return None
+    return value.strip() or None
+
+
+async def process_vehicle_row(row: Dict[str, Any], deadline: Optional[float] = None) -> Dict[str, Any]:
+    """Scraping -> transformación -> fusión de un vehículo. Nunca lanza: el error queda en el resultado."""
+    start = time.monotonic()
+    outcome: Dict[str, Any] = {**row, "status": "failed", "site_status": {}, "error": None, "result": None}
+    try:
+        site_results = await process_sites(
+            row.get("url1"), row.get("url2"), row.get("url3"),
+            transmission_manual_from_option(row.get("transmission_option")),
+            deadline=deadline,
+        )
+        outcome["site_status"] = {site: result.status for site, result in site_results.items()}
+        if any(result.df is not None for result in site_results.values()):
+            outcome["result"] = merge_site_results(site_results)
+            outcome["status"] = "done"
+        else:
+            outcome["error"] = "No se pudo obtener datos de ninguna URL proporcionada."
+    except Exception as e:
+        logger.error(f"Error procesando {row}: {e}", exc_info=True)
+        outcome["error"] = str(e)
+    outcome["elapsed"] = time.monotonic() - start
+    return outcome
+
+
+def _process_row_in_worker(row: Dict[str, Any], deadline: Optional[float]) -> Dict[str, Any]:
+    # Se ejecuta en un proceso del pool: cada proceso tiene sus propios scrapers y cachés en memoria
+    return asyncio.run(process_vehicle_row(row, deadline))
+
+
+def run_bulk_import(
+    rows: List[Dict[str, Any]],
+    workers: int = BULK_IMPORT_WORKERS,
+    deadline: Optional[float] = BULK_IMPORT_DEADLINE,
+    on_progress: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+) -> List[Dict[str, Any]]:
+    """Procesa todas las filas en un pool de procesos y devuelve los resultados en el orden de entrada.
+
+    Cada proceso tiene su propio limitador por host: el total de peticiones a un
+    sitio puede llegar a workers x SCRAPER_HOST_MAX_IN_FLIGHT.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(rows)
+    # "spawn": procesos limpios, sin heredar hilos ni conexiones abiertas del proceso padre
+    context = multiprocessing.get_context("spawn")
+    # Cada proceso ya es un worker: parseo y transformación van en hilos, sin abrir otro pool de
+    # procesos (el initializer se ejecuta antes de importar los scrapers)
+    with ProcessPoolExecutor(max_workers=max(workers, 1), mp_context=context,
+                             initializer=disable_default_cpu_pool) as pool:
+        futures = {pool.submit(_process_row_in_worker, row, deadline): i for i, row in enumerate(rows)}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                results[index] = future.result()
+            except Exception as e:
+                # Solo llega aquí si el proceso murió o el resultado no se pudo transferir
+                results[index] = {**rows[index], "status": "failed", "site_status": {}, "error": str(e), "result": None}
+            if on_progress is not None:
+                on_progress(index, results[index])
+    return results
+
+
+def build_output_table(outcomes: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Tabla única: una fila por clave maestra y una columna 'Valor Final' por vehículo."""
+    table = pd.DataFrame({"Key": MASTER_ORDERED_KEYS})
+    for number, outcome in enumerate(outcomes, start=1):
+        column = f"Vehículo {number}"
+        result = outcome.get("result")
+        if result is None or result.empty:
+            table[column] = "-"
+            continue
+        values = result.assign(Key=result["Key"].astype(str)).drop_duplicates("Key").set_index("Key")["Valor Final"]
+        table[column] = table["Key"].map(values).fillna("-")
+    return table
+
+
+def build_status_table(outcomes: List[Dict[str, Any]]) -> pd.DataFrame:
+    return pd.DataFrame([
+        {
+            "Vehículo": number,
+            "url1": outcome.get("url1"),
+            "url2": outcome.get("url2"),
+            "url3": outcome.get("url3"),
+            "transmission_option": outcome.get("transmission_option"),
+            "Estado": outcome.get("status"),
+            "Sitios": ", ".join(f"{site}={status}" for site, status in (outcome.get("site_status") or {}).items()),
+            "Error": outcome.get("error"),
+        }
+        for number, outcome in enumerate(outcomes, start=1)
+    ])
+
+
+def write_output(outcomes: List[Dict[str, Any]], fmt: str = "xlsx") -> bytes:
+    """Escribe los resultados en un único fichero.
+
+    xlsx: hoja "Valor Final" (tabla de todos los vehículos) y hoja "Estado" (estado por vehículo).
+    csv: solo la tabla de valores finales.
+    """
+    if fmt not in OUTPUT_FORMATS:
+        raise BulkImportError(f"Formato de salida no soportado: '{fmt}'.")
+    table = build_output_table(outcomes)
+    buffer = io.BytesIO()
+    if fmt == "csv":
+        buffer.write(table.to_csv(index=False).encode("utf-8-sig"))  # BOM para que Excel detecte UTF-8
+    else:
+        with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+            table.to_excel(writer, sheet_name="Valor Final", index=False)
+            build_status_table(outcomes).to_excel(writer, sheet_name="Estado", index=False)
+    return buffer.getvalue()
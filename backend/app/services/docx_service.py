@@ -5,6 +5,8 @@ from typing import Dict, Optional, List, Any
 from supabase import Client
 from docxtpl import DocxTemplate
 
+from ..scraping.executors import render_executor
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -63,6 +65,19 @@ REMARK_LABELS = {
 
 
 async def generate_vehicle_docx(
+    data_to_render: List[Dict[str, Any]],
+    language: str,
+    supabase_admin_client: Client
+) -> Optional[bytes]:
+    """
+    Genera el documento DOCX en el executor de documentos: la descarga de la
+    plantilla y el renderizado son bloqueantes y no deben ocupar el event loop
+    ni los hilos del scraping.
+    """
+    return await render_executor.run(render_vehicle_docx, data_to_render, language, supabase_admin_client)
+
+
+def render_vehicle_docx(
     data_to_render: List[Dict[str, Any]], 
     language: str,
     supabase_admin_client: Client
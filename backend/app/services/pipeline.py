@@ -0,0 +1,86 @@
+# backend/app/services/pipeline.py
+import logging
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+import pandas as pd
+
+from ..scraping.executors import cpu_executor
+from ..scraping.process_pool import get_default_cpu_pool
+from .scraping_service import SiteResult, iter_site_results, scrape_site, site_jobs
+from .transform_service import TRANSFORMERS, merge_and_prioritize, transform_site
+
+logger = logging.getLogger(__name__)
+
+
+def transmission_manual_from_option(option: Optional[str]) -> Optional[bool]:
+    """Mapea transmission_option a True (manual), False (automática) o None (por defecto)."""
+    if option == "Manual":
+        return True
+    if option == "Automatic":
+        return False
+    return None
+
+
+async def scrape_and_transform_site(site: str, scraper, url: str, *args) -> SiteResult:
+    """
+    Pipeline de un sitio: la transformación empieza en cuanto termina su scraping,
+    sin esperar a los demás sitios. Se ejecuta en un hilo (CPU) para que las
+    transformaciones de los distintos sitios corran en paralelo, o en el pool de
+    procesos si está activado (CPU_POOL_ENABLED).
+    """
+    result = await scrape_site(scraper, url, *args)
+    if result.df is None:
+        return result
+    cpu_pool = get_default_cpu_pool()
+    try:
+        if cpu_pool is not None:
+            result.transformed = await cpu_pool.run(transform_site, site, result.df)
+        else:
+            result.transformed = await cpu_executor.run(transform_site, site, result.df)
+    except Exception as e:
+        logger.error(f"Error al transformar {site}: {e}", exc_info=True)
+        result.status, result.error = "error", str(e)
+    return result
+
+
+def iter_process_sites(
+    url1: Optional[str],
+    url2: Optional[str],
+    url3: Optional[str],
+    transmission_manual: Optional[bool] = None,
+    deadline: Optional[float] = None,
+) -> AsyncIterator[Tuple[str, SiteResult]]:
+    """
+    Scraping + transformación de cada sitio en paralelo; entrega (sitio, resultado)
+    en cuanto un sitio completa ambas fases. El plazo cubre las dos fases.
+    """
+    jobs = site_jobs(url1, url2, url3, transmission_manual)
+    return iter_site_results(
+        {site: scrape_and_transform_site(site, *job) for site, job in jobs.items()},
+        deadline,
+    )
+
+
+async def process_sites(
+    url1: Optional[str],
+    url2: Optional[str],
+    url3: Optional[str],
+    transmission_manual: Optional[bool] = None,
+    deadline: Optional[float] = None,
+) -> Dict[str, SiteResult]:
+    """
+    Como scrape_sites, pero cada resultado trae también su DataFrame transformado.
+    Tiempo total = max(scraping + transformación) de los sitios, no max(scraping) + suma de transformaciones.
+    """
+    results = {}
+    async for site, result in iter_process_sites(url1, url2, url3, transmission_manual, deadline):
+        results[site] = result
+    # Mismo orden que las URLs (site1, site2, site3)
+    return {site: results[site] for site in sorted(results)}
+
+
+def merge_site_results(site_results: Dict[str, SiteResult]) -> pd.DataFrame:
+    """Fusiona los DataFrames transformados de cada sitio (los que falten cuentan como vacíos)."""
+    transformed_dfs = {site: None for site in TRANSFORMERS}
+    transformed_dfs.update({site: result.transformed for site, result in site_results.items()})
+    return merge_and_prioritize(transformed_dfs)
@@ -1,76 +1,281 @@
 # backend/app/services/scraping_service.py
 import asyncio
+import time
 import pandas as pd
-from typing import Dict, Optional, Any
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, Optional, Tuple
 
 # Importamos tus clases Scraper desde la carpeta scraping
 # La ruta es relativa desde 'app'
 from ..scraping.scraping_site_1 import Site1Scraper
 from ..scraping.scraping_site_2 import Site2Scraper
 from ..scraping.scraping_site_3 import Site3Scraper
+from ..scraping.html_cache import canonical_url, get_default_html_cache
+from ..scraping.result_cache import get_default_result_cache
+from ..scraping.rate_limiter import get_default_host_limiter
+from ..scraping.errors import CircuitOpenError, DeadlineExceeded, FetchError
+from ..scraping.deadline import deadline_scope, detached_context, remaining
+from ..scraping.process_pool import get_default_cpu_pool
 
 # Creamos instancias de tus scrapers
 site1_scraper = Site1Scraper()
 site2_scraper = Site2Scraper()
 site3_scraper = Site3Scraper()
 
-async def run_scraping_for_site(scraper, url: str, *args) -> Optional[pd.DataFrame]:
+SCRAPERS = {
+    "site1": site1_scraper,
+    "site2": site2_scraper,
+    "site3": site3_scraper,
+}
+
+class SingleFlight:
+    """Agrupa llamadas concurrentes idénticas en una sola ejecución.
+
+    Si llega una petición con la misma clave mientras otra está en curso, espera
+    el resultado de la primera en lugar de repetir la descarga y el parseo.
+    La tarea compartida no se cancela aunque el primer llamante se cancele, y se
+    ejecuta sin el plazo de quien la inicia: cada llamante aplica el suyo al esperar.
     """
-    Ejecuta el método scrape de un scraper de forma asíncrona.
-    Maneja errores básicos.
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self._stats = {"leaders": 0, "coalesced": 0}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._in_flight.get(key)
+        if task is None:
+            self._stats["leaders"] += 1
+            task = asyncio.get_running_loop().create_task(func(), context=detached_context())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        else:
+            self._stats["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: asyncio.Task) -> None:
+        self._in_flight.pop(key, None)
+        # Si todos los llamantes se fueron (p. ej. por plazo agotado), nadie lee el error:
+        # se recupera aquí para que asyncio no avise de una excepción no recuperada.
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        return {**self._stats, "in_flight": len(self._in_flight)}
+
+
+scrape_flights = SingleFlight()
+
+
+async def _scrape_shared(scraper, url: str, *args) -> pd.DataFrame:
+    """scrape_async compartido entre peticiones concurrentes a la misma URL canónica y opciones.
+
+    La descarga compartida no tiene plazo: aquí se espera como mucho lo que queda del de
+    este llamante, y al vencer se informa de DeadlineExceeded sin cancelar a los demás.
+    """
+    key = (type(scraper).__name__, canonical_url(url), args)
+    budget = remaining()
+    if budget is not None and budget <= 0:
+        raise DeadlineExceeded(url, "plazo agotado")
+    try:
+        df = await asyncio.wait_for(scrape_flights.do(key, lambda: scraper.scrape_async(url, *args)), budget)
+    except asyncio.TimeoutError as e:
+        raise DeadlineExceeded(url, "plazo agotado") from e
+    # Cada llamante recibe su propia copia del DataFrame
+    return df.copy()
+
+
+@dataclass
+class SiteResult:
+    """Resultado del scraping de un sitio.
+
+    status: "ok", "error", "unavailable" (circuit breaker abierto) o "timeout" (plazo agotado).
+    transformed solo se rellena en el pipeline scraping + transformación (ver pipeline.py).
+    """
+    status: str
+    df: Optional[pd.DataFrame] = None
+    error: Optional[str] = None
+    transformed: Optional[pd.DataFrame] = None
+
+
+async def scrape_site(scraper, url: str, *args) -> SiteResult:
+    """
+    Ejecuta el método scrape_async de un scraper y clasifica el resultado.
     """
-    if not url:
-        return None
     try:
         print(f"Iniciando scraping para: {url}")
-        # asyncio.to_thread ejecuta una función síncrona (como tu scrape)
-        # en un hilo separado, para no bloquear el servidor FastAPI.
-        df = await asyncio.to_thread(scraper.scrape, url, *args)
+        # La descarga es asíncrona (no ocupa hilos mientras espera la red);
+        # solo el parseo del HTML se ejecuta en un hilo separado.
+        df = await _scrape_shared(scraper, url, *args)
         print(f"Scraping completado para: {url}. Filas: {len(df)}")
-        return df
+        return SiteResult("ok", df)
+    except DeadlineExceeded as e:
+        print(f"PLAZO AGOTADO para {url}: {e}")
+        return SiteResult("timeout", error=str(e))
+    except CircuitOpenError as e:
+        # El sitio está marcado como caído: se omite sin esperar a la red
+        print(f"OMITIDO {url}: {e}")
+        return SiteResult("unavailable", error=str(e))
+    except FetchError as e:
+        print(f"ERROR al scrapear {url} ({type(e).__name__}): {e}")
+        return SiteResult("error", error=str(e))
     except Exception as e:
         print(f"ERROR al scrapear {url}: {e}")
+        return SiteResult("error", error=str(e))
+
+
+async def run_scraping_for_site(scraper, url: str, *args) -> Optional[pd.DataFrame]:
+    """
+    Ejecuta el método scrape_async de un scraper.
+    Maneja errores básicos.
+    """
+    if not url:
         return None
+    return (await scrape_site(scraper, url, *args)).df
+
+
+def site_jobs(
+    url1: Optional[str],
+    url2: Optional[str],
+    url3: Optional[str],
+    transmission_manual: Optional[bool] = None,
+) -> Dict[str, tuple]:
+    """(scraper, url, *args) de cada sitio con URL, en orden site1..site3."""
+    jobs = {}
+    if url1:
+        jobs["site1"] = (site1_scraper, url1)
+    if url2:
+        jobs["site2"] = (site2_scraper, url2, transmission_manual)
+    if url3:
+        jobs["site3"] = (site3_scraper, url3)
+    return jobs
+
+
+async def iter_site_results(
+    coros: Dict[str, Awaitable[SiteResult]],
+    deadline: Optional[float] = None,
+) -> AsyncIterator[Tuple[str, SiteResult]]:
+    """
+    Ejecuta en paralelo una corrutina por sitio y entrega (sitio, resultado) en cuanto termina cada una.
+
+    Al vencer el plazo se entregan los sitios pendientes como "timeout". Si quien
+    consume deja de iterar (p. ej. el cliente cierra la conexión), se cancelan.
+    """
+    if not coros:
+        return
+
+    # Las tareas copian el contexto al crearse, así que heredan el plazo;
+    # no se mantiene el plazo activo entre yields para no filtrarlo a quien consume.
+    with deadline_scope(deadline):
+        tasks = {asyncio.ensure_future(coro): site for site, coro in coros.items()}
+    ends_at = time.monotonic() + deadline if deadline is not None else None
+
+    pending = set(tasks)
+    try:
+        while pending:
+            timeout = max(ends_at - time.monotonic(), 0) if ends_at is not None else None
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for task in done:
+                yield tasks[task], task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+    for task in pending:
+        site = tasks[task]
+        print(f"PLAZO AGOTADO para {site}: no terminó en {deadline}s")
+        yield site, SiteResult("timeout", error=f"No terminó en {deadline}s")
+
+
+def iter_scrape_sites(
+    url1: Optional[str],
+    url2: Optional[str],
+    url3: Optional[str],
+    transmission_manual: Optional[bool] = None,
+    deadline: Optional[float] = None,
+) -> AsyncIterator[Tuple[str, SiteResult]]:
+    """
+    Igual que scrape_sites, pero entrega (sitio, resultado) en cuanto termina cada sitio.
+    """
+    jobs = site_jobs(url1, url2, url3, transmission_manual)
+    return iter_site_results({site: scrape_site(*job) for site, job in jobs.items()}, deadline)
+
+
+async def scrape_sites(
+    url1: Optional[str],
+    url2: Optional[str],
+    url3: Optional[str],
+    transmission_manual: Optional[bool] = None,
+    deadline: Optional[float] = None,
+) -> Dict[str, SiteResult]:
+    """
+    Ejecuta el scraping de las URLs proporcionadas en paralelo, con un plazo total opcional (segundos).
+
+    El plazo se propaga a cada descarga (timeouts y reintentos se recortan a lo que queda).
+    Al vencer se devuelve lo que haya terminado; los sitios pendientes quedan como "timeout".
+    """
+    results = {}
+    async for site, result in iter_scrape_sites(url1, url2, url3, transmission_manual, deadline):
+        results[site] = result
+    # Mismo orden que las URLs (site1, site2, site3)
+    return {site: results[site] for site in sorted(results)}
+
 
 async def process_all_urls(
     url1: Optional[str],
     url2: Optional[str],
     url3: Optional[str],
-    transmission_manual: Optional[bool] = None
+    transmission_manual: Optional[bool] = None,
+    deadline: Optional[float] = None,
 ) -> Dict[str, Optional[pd.DataFrame]]:
     """
     Ejecuta el scraping para todas las URLs proporcionadas en paralelo.
     """
-    tasks = []
+    results = await scrape_sites(url1, url2, url3, transmission_manual, deadline)
+    return {site: result.df for site, result in results.items()}
 
-    # Creamos tareas para cada scraper si la URL está presente
-    if url1:
-        tasks.append(run_scraping_for_site(site1_scraper, url1))
-    if url2:
-        tasks.append(run_scraping_for_site(site2_scraper, url2, transmission_manual))
-    if url3:
-        tasks.append(run_scraping_for_site(site3_scraper, url3))
 
-    # Si no hay tareas, devolvemos un diccionario vacío
-    if not tasks:
-        return {}
+def get_connection_stats() -> Dict[str, Any]:
+    """Métricas de reutilización de conexiones keep-alive de cada scraper."""
+    return {site: scraper.connection_stats() for site, scraper in SCRAPERS.items()}
 
-    # Ejecutamos todas las tareas de scraping concurrentemente
-    results = await asyncio.gather(*tasks)
 
-    # Mapeamos los resultados de vuelta a los sitios
-    processed_data = {}
-    task_index = 0
-    if url1:
-        processed_data["site1"] = results[task_index]
-        task_index += 1
-    if url2:
-        processed_data["site2"] = results[task_index]
-        task_index += 1
-    if url3:
-        processed_data["site3"] = results[task_index]
+def get_cache_stats() -> Dict[str, Any]:
+    """Métricas de la caché HTML en disco y de la caché de resultados parseados."""
+    html_cache = get_default_html_cache()
+    result_cache = get_default_result_cache()
+    return {
+        "html": html_cache.stats() if html_cache is not None else {"enabled": False},
+        "results": result_cache.stats() if result_cache is not None else {"enabled": False},
+        "coalescing": scrape_flights.stats(),
+    }
+
+
+def get_rate_limit_stats() -> Dict[str, Any]:
+    """Peticiones, en vuelo y tiempo de espera por host del limitador de scraping."""
+    limiter = get_default_host_limiter()
+    return limiter.stats() if limiter is not None else {"enabled": False}
+
+
+def get_resilience_stats() -> Dict[str, Any]:
+    """Estado del circuit breaker de cada sitio."""
+    return {site: scraper.resilience_stats() for site, scraper in SCRAPERS.items()}
+
+
+def get_cpu_pool_stats() -> Dict[str, Any]:
+    """Ocupación del pool de procesos de parseo/transformación (profundidad de cola, esperas)."""
+    cpu_pool = get_default_cpu_pool()
+    return cpu_pool.stats() if cpu_pool is not None else {"enabled": False}
+
 
-    return processed_data
+async def close_scrapers() -> None:
+    """Cierra las sesiones HTTP de los scrapers (se llama al apagar la aplicación)."""
+    for scraper in SCRAPERS.values():
+        await scraper.aclose()
+    cpu_pool = get_default_cpu_pool()
+    if cpu_pool is not None:
+        cpu_pool.shutdown()
 
 
 
@@ -17,28 +17,35 @@ transformer3 = VehicleDataTransformer_site3(DEFAULT_CONFIG_3)
 
 logger = logging.getLogger(__name__)
 
+TRANSFORMERS = {
+    "site1": transformer1,
+    "site2": transformer2,
+    "site3": transformer3,
+}
+
+def transform_site(site: str, df: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+    """Transforma el DataFrame scrapeado de un sitio (None si no hay datos)."""
+    if df is None or df.empty:
+        return None
+    return TRANSFORMERS[site].transform(df)
+
+def transform_site_batch(
+    site: str,
+    df: Optional[pd.DataFrame],
+    id_column: str = "vehicle_id",
+    errors: Optional[Dict[Any, Exception]] = None,
+) -> Optional[pd.DataFrame]:
+    """Transforma en una sola llamada los datos scrapeados de varios vehículos de un sitio:
+    una tabla larga con la columna id_column (ver BaseVehicleDataTransformer.transform_batch)."""
+    if df is None or df.empty:
+        return None
+    return TRANSFORMERS[site].transform_batch(df, id_column=id_column, errors=errors)
+
 def apply_transformations(
     scraped_data: Dict[str, Optional[pd.DataFrame]]
 ) -> Dict[str, Optional[pd.DataFrame]]:
     """Aplica las transformaciones a cada DataFrame scrapeado."""
-    transformed_data = {}
-
-    if "site1" in scraped_data and scraped_data["site1"] is not None and not scraped_data["site1"].empty:
-        transformed_data["site1"] = transformer1.transform(scraped_data["site1"])
-    else:
-        transformed_data["site1"] = None
-
-    if "site2" in scraped_data and scraped_data["site2"] is not None and not scraped_data["site2"].empty:
-        transformed_data["site2"] = transformer2.transform(scraped_data["site2"])
-    else:
-        transformed_data["site2"] = None
-
-    if "site3" in scraped_data and scraped_data["site3"] is not None and not scraped_data["site3"].empty:
-        transformed_data["site3"] = transformer3.transform(scraped_data["site3"])
-    else:
-        transformed_data["site3"] = None
-
-    return transformed_data
+    return {site: transform_site(site, scraped_data.get(site)) for site in TRANSFORMERS}
 
 def merge_and_prioritize(
     transformed_data: Dict[str, Optional[pd.DataFrame]]
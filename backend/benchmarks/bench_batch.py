@@ -0,0 +1,86 @@
+# benchmarks/bench_batch.py
+"""
+Compara transformar un lote de vehículos uno a uno (transform) con una sola llamada
+(transform_batch sobre la tabla larga con la columna vehicle_id), y comprueba que
+cada vehículo del lote sale idéntico a su transform().
+
+Las páginas guardadas se parsean una vez y se repiten hasta completar el lote:
+
+    python -m benchmarks.bench_batch --site 1 --vehicles 500 pages/site1
+    python -m benchmarks.bench_batch --site 2 --vehicles 100 --vehicles 1000 pages/site2/*.html
+"""
+import argparse
+import statistics
+import sys
+import time
+
+import pandas as pd
+
+from benchmarks.bench_parsers import SCRAPERS, _collect_pages
+from benchmarks.bench_transformers import TRANSMISSION, load_transformer, same_output, _transform
+
+ID_COLUMN = "vehicle_id"
+
+
+def _loop(transformer, inputs):
+    return [_transform(transformer, df) for df in inputs]
+
+
+def _batch(transformer, inputs):
+    long_df = pd.concat([df.assign(**{ID_COLUMN: i}) for i, df in enumerate(inputs)], ignore_index=True)
+    start = time.perf_counter()
+    errors = {}
+    result = transformer.transform_batch(long_df, id_column=ID_COLUMN, errors=errors)
+    return result, errors, time.perf_counter() - start
+
+
+def _split(result, errors, count):
+    """Salida del lote por vehículo, como la de transform() (o la excepción)."""
+    outputs = {i: group.drop(columns=ID_COLUMN).reset_index(drop=True)
+               for i, group in result.groupby(ID_COLUMN, sort=False)}
+    return [errors.get(i, outputs.get(i)) for i in range(count)]
+
+
+def run(site: str, paths, sizes, repeat: int, transmission: str) -> None:
+    scraper = SCRAPERS[site]()
+    args = (TRANSMISSION[transmission],) if site == "2" else ()
+    pages = []
+    for path in _collect_pages(paths):
+        with open(path, "r", encoding="utf-8") as f:
+            pages.append(scraper.parse_html(f.read(), *args))
+    pages = [df for df in pages if df is not None and not df.empty]
+    if not pages:
+        sys.exit("No se encontraron páginas .html con datos")
+
+    transformer = load_transformer(site)
+    print(f"Sitio {site}: {len(pages)} páginas, {repeat} repeticiones")
+    print(f"{'vehículos':>10} {'uno a uno (ms)':>15} {'lote (ms)':>10} {'aceleración':>12} {'idénticos':>10}")
+    for size in sizes:
+        inputs = [pages[i % len(pages)] for i in range(size)]
+        result, errors, _ = _batch(transformer, inputs)
+        expected = _loop(transformer, inputs)
+        identical = sum(same_output(a, b) for a, b in zip(expected, _split(result, errors, size)))
+
+        loop_times, batch_times = [], []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            _loop(transformer, inputs)
+            loop_times.append(time.perf_counter() - start)
+            batch_times.append(_batch(transformer, inputs)[2])
+        loop_ms, batch_ms = statistics.median(loop_times) * 1000, statistics.median(batch_times) * 1000
+        print(f"{size:>10} {loop_ms:>15.1f} {batch_ms:>10.1f} {loop_ms / batch_ms:>11.2f}x {identical:>6}/{size}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--site", choices=SCRAPERS, required=True)
+    parser.add_argument("--vehicles", type=int, action="append", help="Tamaño del lote (repetible)")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--transmission", choices=TRANSMISSION, default="default", help="Solo sitio 2")
+    parser.add_argument("paths", nargs="+", help="Ficheros .html o directorios")
+    args = parser.parse_args()
+    run(args.site, args.paths, args.vehicles or [1, 10, 100, 1000], args.repeat, args.transmission)
+
+
+if __name__ == "__main__":
+    main()
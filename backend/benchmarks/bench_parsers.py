@@ -0,0 +1,118 @@
+# benchmarks/bench_parsers.py
+"""
+Compara el tiempo de parseo por página de cada backend HTML sobre páginas guardadas.
+
+Guardar páginas (una vez, con red):
+    python -m benchmarks.bench_parsers fetch --site 2 --out pages/site2 URL [URL ...]
+
+Medir (sin red):
+    python -m benchmarks.bench_parsers run --site 2 pages/site2/*.html
+    python -m benchmarks.bench_parsers run --site 3 --repeat 20 pages/site3
+
+Para cada parser se indica además si su resultado es idéntico al de 'html.parser'.
+"""
+import argparse
+import hashlib
+import os
+import statistics
+import sys
+import time
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+from app.scraping.base_scraper import BaseScraper
+from app.scraping.scraping_site_1 import Site1Scraper
+from app.scraping.scraping_site_2 import Site2Scraper
+from app.scraping.scraping_site_3 import Site3Scraper, LexborHTMLParser
+
+SCRAPERS = {"1": Site1Scraper, "2": Site2Scraper, "3": Site3Scraper}
+PARSERS = ["html.parser", "lxml", "selectolax"]
+
+
+def _collect_pages(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(
+                os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith(".html")
+            )
+        else:
+            files.append(path)
+    return files
+
+
+def _available(scraper_cls, parser: str) -> bool:
+    if parser == "selectolax":
+        # Solo tiene sentido en scrapers con ruta propia para lexbor
+        return LexborHTMLParser is not None and scraper_cls.parse_html is not BaseScraper.parse_html
+    try:
+        BeautifulSoup("", parser)
+    except FeatureNotFound:
+        return False
+    return True
+
+
+def fetch(site: str, urls, out_dir: str) -> None:
+    os.makedirs(out_dir, exist_ok=True)
+    scraper = SCRAPERS[site]()
+    for url in urls:
+        html = scraper.fetch_html(url)
+        name = hashlib.sha1(url.encode("utf-8")).hexdigest()[:12] + ".html"
+        with open(os.path.join(out_dir, name), "w", encoding="utf-8") as f:
+            f.write(html)
+        print(f"{url} -> {name} ({len(html) / 1024:.0f} KB)")
+
+
+def run(site: str, paths, repeat: int) -> None:
+    pages = []
+    for path in _collect_pages(paths):
+        with open(path, "r", encoding="utf-8") as f:
+            pages.append(f.read())
+    if not pages:
+        sys.exit("No se encontraron páginas .html")
+
+    reference = None
+    print(f"Sitio {site}: {len(pages)} páginas, {repeat} repeticiones")
+    print(f"{'parser':<12} {'ms/página (mediana)':>20} {'ms/página (media)':>18} {'idéntico':>9}")
+    for parser in PARSERS:
+        if not _available(SCRAPERS[site], parser):
+            print(f"{parser:<12} {'no disponible':>20}")
+            continue
+        scraper = SCRAPERS[site](parser=parser)
+        timings = []
+        outputs = []
+        for _ in range(repeat):
+            for html in pages:
+                start = time.perf_counter()
+                outputs.append(scraper.parse_html(html))
+                timings.append((time.perf_counter() - start) * 1000)
+        outputs = outputs[:len(pages)]
+        if reference is None:
+            reference = outputs
+        identical = all(a.equals(b) for a, b in zip(reference, outputs))
+        print(f"{parser:<12} {statistics.median(timings):>20.2f} {statistics.mean(timings):>18.2f} {str(identical):>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    fetch_cmd = sub.add_parser("fetch", help="Descarga y guarda páginas para el benchmark")
+    fetch_cmd.add_argument("--site", choices=SCRAPERS, required=True)
+    fetch_cmd.add_argument("--out", required=True)
+    fetch_cmd.add_argument("urls", nargs="+")
+
+    run_cmd = sub.add_parser("run", help="Mide el parseo de páginas guardadas")
+    run_cmd.add_argument("--site", choices=SCRAPERS, required=True)
+    run_cmd.add_argument("--repeat", type=int, default=10)
+    run_cmd.add_argument("paths", nargs="+", help="Ficheros .html o directorios")
+
+    args = parser.parse_args()
+    if args.command == "fetch":
+        fetch(args.site, args.urls, args.out)
+    else:
+        run(args.site, args.paths, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# benchmarks/bench_regex.py
+"""
+Mide el trabajo de expresiones regulares de los transformadores.
+
+Sin argumentos, compara cada patrón del registro (app.data_transformation.patterns)
+llamado como antes, con re.search(r'...', texto) y similares, frente al patrón ya compilado:
+
+    python -m benchmarks.bench_regex
+
+Con --site y --against cuenta además las llamadas a funciones del módulo re
+(re.search, re.compile, ...) que hace el transformador por vehículo, en la revisión
+indicada y en el actual, y el tiempo por transformación:
+
+    python -m benchmarks.bench_regex --site 2 --against HEAD~1 pages/site2
+"""
+import argparse
+import functools
+import re
+import statistics
+import sys
+import time
+import timeit
+
+from app.data_transformation import patterns
+from benchmarks.bench_parsers import SCRAPERS, _collect_pages
+from benchmarks.bench_transformers import TRANSFORM_PACKAGE, TRANSMISSION, load_transformer, _transform
+
+# Nombre del patrón -> (método, argumentos de ejemplo tras el patrón)
+SAMPLES = {
+    "PARENTHESIS_TEXT": ("sub", ("", "40,5 kW (55 pk)")),
+    "NEDC_FUEL_LITER": ("search", ("5,6 liter/100km",)),
+    "WLTP_FUEL_VALUE": ("search", ("6,4 liter/100km",)),
+    "CM_VALUE": ("sub", (lambda m: str(int(float(m.group(1)) * 10)), "270 cm")),
+    "TRANSMISSION_DUAL_CLUTCH": ("match", ("m6",)),
+    "TRANSMISSION_AUTOMATIC": ("match", ("m6",)),
+    "TRANSMISSION_MANUAL": ("match", ("m6",)),
+    "VMAX_MECH": ("search", ("mech 190 - autom 188",)),
+    "VMAX_AUTOM": ("search", ("mech 190 - autom 188",)),
+    "MARK_GLOBAL": ("findall", ("Anhängevorrichtung e2*94/20*1234   Weitere Angaben",)),
+    "EMISSIONS_PREFIX": ("sub", ("", "72 Emissions - CO (mec)")),
+    "PARENTHESIS_SUFFIX": ("sub", ("", "CO (mec)")),
+}
+MARK_TEXT = "Anhängevorrichtung Konformitätszeichen e2*94/20*1234   Weitere Angaben"
+MARK_KEYS = ('Konformitätszeichen', 'Genehmigungszeichen', 'Genehmigungsnummer')
+
+RE_FUNCTIONS = ("compile", "search", "match", "fullmatch", "sub", "subn", "split", "findall", "finditer")
+
+
+def _marks_on_the_fly(text):
+    # Como extract_marks_simple antes del registro: un patrón construido por clave en cada llamada
+    for clave in MARK_KEYS:
+        re.compile(rf'{re.escape(clave)}\s*[:\-]?\s*(.+?)(?=\s{{3,}}|$)', flags=re.IGNORECASE).findall(text)
+
+
+def _marks_compiled(text):
+    for pattern in patterns.MARK_KEYWORDS:
+        pattern.findall(text)
+
+
+def _best_us(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def micro(number: int) -> None:
+    cases = []
+    for name, (method, args) in SAMPLES.items():
+        pattern = getattr(patterns, name)
+        on_the_fly = functools.partial(getattr(re, method), pattern.pattern, *args, flags=pattern.flags)
+        cases.append((name, on_the_fly, functools.partial(getattr(pattern, method), *args)))
+    cases.append(("MARK_KEYWORDS (3)", functools.partial(_marks_on_the_fly, MARK_TEXT),
+                  functools.partial(_marks_compiled, MARK_TEXT)))
+
+    print(f"{'patrón':<26} {'re.<función> (us)':>18} {'compilado (us)':>15} {'aceleración':>12}")
+    for name, on_the_fly, compiled in cases:
+        before, after = _best_us(on_the_fly, number), _best_us(compiled, number)
+        print(f"{name:<26} {before:>18.3f} {after:>15.3f} {before / after:>11.2f}x")
+
+
+def _count_re_calls(transformer, inputs) -> float:
+    """Llamadas a funciones del módulo re hechas desde app.data_transformation, por vehículo."""
+    calls = 0
+    originals = {name: getattr(re, name) for name in RE_FUNCTIONS}
+
+    def counting(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            nonlocal calls
+            if sys._getframe(1).f_globals.get("__name__", "").startswith(TRANSFORM_PACKAGE):
+                calls += 1
+            return func(*args, **kwargs)
+        return wrapper
+
+    try:
+        for name, func in originals.items():
+            setattr(re, name, counting(func))
+        for df in inputs:
+            _transform(transformer, df)
+    finally:
+        for name, func in originals.items():
+            setattr(re, name, func)
+    return calls / len(inputs)
+
+
+def per_transform(site: str, paths, against: str, repeat: int, transmission: str) -> None:
+    scraper = SCRAPERS[site]()
+    args = (TRANSMISSION[transmission],) if site == "2" else ()
+    inputs = []
+    for path in _collect_pages(paths):
+        with open(path, "r", encoding="utf-8") as f:
+            inputs.append(scraper.parse_html(f.read(), *args))
+    if not inputs:
+        sys.exit("No se encontraron páginas .html")
+
+    print(f"\nSitio {site}: {len(inputs)} vehículos, {repeat} repeticiones")
+    print(f"{'transformador':<14} {'llamadas re.* / vehículo':>25} {'ms/vehículo (mediana)':>22}")
+    for label, transformer in ((against, load_transformer(site, against)), ("actual", load_transformer(site))):
+        calls = _count_re_calls(transformer, inputs)
+        timings = []
+        for _ in range(repeat):
+            for df in inputs:
+                start = time.perf_counter()
+                _transform(transformer, df)
+                timings.append((time.perf_counter() - start) * 1000)
+        print(f"{label:<14} {calls:>25.1f} {statistics.median(timings):>22.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=20000, help="Llamadas por medición en los patrones")
+    parser.add_argument("--site", choices=SCRAPERS)
+    parser.add_argument("--against", help="Revisión de git con la que comparar (p. ej. HEAD~1)")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--transmission", choices=TRANSMISSION, default="default", help="Solo sitio 2")
+    parser.add_argument("paths", nargs="*", help="Ficheros .html o directorios")
+    args = parser.parse_args()
+    if args.site and not (args.against and args.paths):
+        parser.error("--site necesita --against y al menos una página")
+
+    micro(args.number)
+    if args.site:
+        per_transform(args.site, args.paths, args.against, args.repeat, args.transmission)
+
+
+if __name__ == "__main__":
+    main()
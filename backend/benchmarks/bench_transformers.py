@@ -0,0 +1,122 @@
+# benchmarks/bench_transformers.py
+"""
+Compara el transformador actual de un sitio con el de otra revisión de git:
+tiempo por vehículo y si la salida es idéntica fila a fila (claves, valores y tipos).
+
+Las entradas son páginas guardadas (ver bench_parsers fetch), que se parsean
+una vez con el scraper del sitio; solo se mide la transformación.
+
+    python -m benchmarks.bench_transformers --site 1 --against HEAD~1 pages/site1
+    python -m benchmarks.bench_transformers --site 2 --transmission manual --against <rev> pages/site2/*.html
+"""
+import argparse
+import importlib
+import importlib.util
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.bench_parsers import SCRAPERS, _collect_pages
+
+TRANSFORM_PACKAGE = "app.data_transformation"
+TRANSMISSION = {"default": None, "manual": True, "automatic": False}
+
+
+def load_transformer(site: str, rev=None):
+    """Instancia el transformador del sitio; con rev, el de esa revisión de git."""
+    module = importlib.import_module(f"{TRANSFORM_PACKAGE}.transform_site{site}")
+    if rev is not None:
+        path = module.__file__
+        source = subprocess.run(
+            ["git", "-C", os.path.dirname(path), "show", f"{rev}:./{os.path.basename(path)}"],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        # Se carga dentro del mismo paquete para que sus imports relativos funcionen
+        name = f"{TRANSFORM_PACKAGE}._bench_site{site}_{rev.replace('~', '_').replace('^', '_')}"
+        spec = importlib.util.spec_from_loader(name, loader=None)
+        module = importlib.util.module_from_spec(spec)
+        module.__package__ = TRANSFORM_PACKAGE
+        sys.modules[name] = module
+        exec(compile(source, f"{rev}:{path}", "exec"), module.__dict__)
+    return getattr(module, f"VehicleDataTransformer_site{site}")(getattr(module, f"DEFAULT_CONFIG_{site}"))
+
+
+def _rows(df):
+    return [(key, type(value), value) for key, value in zip(df["Key"].astype(object), df["Value"])]
+
+
+def same_output(a, b) -> bool:
+    if isinstance(a, Exception) or isinstance(b, Exception):
+        return type(a) is type(b)
+    return (
+        a.equals(b)
+        and list(a.columns) == list(b.columns)
+        and a.dtypes.equals(b.dtypes)
+        and _rows(a) == _rows(b)
+    )
+
+
+def _transform(transformer, df):
+    try:
+        return transformer.transform(df.copy())
+    except Exception as e:
+        return e
+
+
+def _time(transformer, inputs, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        for df in inputs:
+            start = time.perf_counter()
+            _transform(transformer, df)
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def run(site: str, paths, against: str, repeat: int, transmission: str) -> None:
+    scraper = SCRAPERS[site]()
+    args = (TRANSMISSION[transmission],) if site == "2" else ()
+    inputs, names = [], []
+    for path in _collect_pages(paths):
+        with open(path, "r", encoding="utf-8") as f:
+            inputs.append(scraper.parse_html(f.read(), *args))
+        names.append(os.path.basename(path))
+    if not inputs:
+        sys.exit("No se encontraron páginas .html")
+
+    current = load_transformer(site)
+    baseline = load_transformer(site, against)
+
+    different = [
+        name for name, df in zip(names, inputs)
+        if not same_output(_transform(baseline, df), _transform(current, df))
+    ]
+    for name in different:
+        print(f"DIFERENTE: {name}")
+
+    print(f"Sitio {site}: {len(inputs)} vehículos, {repeat} repeticiones")
+    print(f"{'transformador':<14} {'ms/vehículo (mediana)':>22} {'ms/vehículo (media)':>20}")
+    medians = {}
+    for label, transformer in ((against, baseline), ("actual", current)):
+        timings = _time(transformer, inputs, repeat)
+        medians[label] = statistics.median(timings)
+        print(f"{label:<14} {medians[label]:>22.3f} {statistics.mean(timings):>20.3f}")
+    print(f"Aceleración: x{medians[against] / medians['actual']:.2f}   "
+          f"Salida idéntica: {len(inputs) - len(different)}/{len(inputs)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--site", choices=SCRAPERS, required=True)
+    parser.add_argument("--against", required=True, help="Revisión de git con la que comparar (p. ej. HEAD~1)")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--transmission", choices=TRANSMISSION, default="default", help="Solo sitio 2")
+    parser.add_argument("paths", nargs="+", help="Ficheros .html o directorios")
+    args = parser.parse_args()
+    run(args.site, args.paths, args.against, args.repeat, args.transmission)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# tests/test_resilience.py
+# Ejecutar desde backend/: python -m pytest tests
+
+import asyncio
+
+import pytest
+
+from app.scraping.base_scraper import BaseScraper
+from app.scraping.errors import CircuitOpenError, DeadlineExceeded, FetchTimeout
+from app.scraping.resilience import CircuitBreaker, RetryPolicy
+
+URL = "https://example.com/vehiculo"
+
+
+def _half_open_breaker() -> CircuitBreaker:
+    """Breaker que abre con un fallo y pasa a semiabierto al instante."""
+    breaker = CircuitBreaker("test", threshold=1, reset_timeout=0)
+    breaker.record_failure(FetchTimeout(URL, "timeout"))
+    assert breaker.state == "half_open"
+    return breaker
+
+
+def test_probe_success_closes():
+    breaker = _half_open_breaker()
+    probe = breaker.before_request(URL)
+    assert probe is not None
+    breaker.record_success()
+    breaker.release_probe(probe)
+    assert breaker.state == "closed"
+    assert breaker.before_request(URL) is None
+
+
+def test_probe_failure_reopens():
+    breaker = CircuitBreaker("test", threshold=1, reset_timeout=60)
+    breaker.record_failure(FetchTimeout(URL, "timeout"))
+    breaker._opened_at -= 60  # pasado el reset_timeout
+    probe = breaker.before_request(URL)
+    breaker.record_failure(FetchTimeout(URL, "timeout"))
+    breaker.release_probe(probe)
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request(URL)
+
+
+def test_only_one_probe_at_a_time():
+    breaker = _half_open_breaker()
+    breaker.before_request(URL)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request(URL)
+
+
+def test_probe_without_result_is_released():
+    # La prueba termina sin record_success/record_failure (plazo agotado, cancelación...)
+    breaker = _half_open_breaker()
+    probe = breaker.before_request(URL)
+    breaker.release_probe(probe)
+    assert breaker.state == "half_open"
+    assert breaker.before_request(URL) is not None
+
+
+def test_stale_probe_does_not_release_new_probe():
+    breaker = _half_open_breaker()
+    first = breaker.before_request(URL)
+    breaker.record_failure(FetchTimeout(URL, "timeout"))  # reabre (reset_timeout=0: semiabierto ya)
+    second = breaker.before_request(URL)
+    breaker.release_probe(first)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request(URL)
+    breaker.release_probe(second)
+    assert breaker.before_request(URL) is not None
+
+
+def _scraper(breaker: CircuitBreaker, error: Exception) -> BaseScraper:
+    scraper = BaseScraper(retry_policy=RetryPolicy(retries=0), circuit_breaker=breaker)
+    scraper._cached_entry = lambda url: None
+
+    def fail(*args, **kwargs):
+        raise error
+
+    scraper._fetch_once = fail
+    scraper._get_async_once = fail
+    return scraper
+
+
+@pytest.mark.parametrize("error", [DeadlineExceeded(URL, "plazo agotado"), OSError("disco lleno")])
+def test_fetch_html_releases_probe(error):
+    breaker = _half_open_breaker()
+    with pytest.raises(type(error)):
+        _scraper(breaker, error).fetch_html(URL)
+    assert breaker.state == "half_open"
+    assert breaker.before_request(URL) is not None
+
+
+@pytest.mark.parametrize("error", [DeadlineExceeded(URL, "plazo agotado"), asyncio.CancelledError()])
+def test_fetch_html_async_releases_probe(error):
+    breaker = _half_open_breaker()
+    scraper = _scraper(breaker, error)
+    with pytest.raises(type(error)):
+        asyncio.run(scraper.fetch_html_async(URL))
+    assert breaker.state == "half_open"
+    assert breaker.before_request(URL) is not None
@@ -0,0 +1,68 @@
+# tests/test_single_flight.py
+# Ejecutar desde backend/: python -m pytest tests
+
+import asyncio
+
+import pandas as pd
+import pytest
+
+from app.scraping import deadline
+from app.scraping.errors import DeadlineExceeded
+from app.services import scraping_service
+from app.services.scraping_service import SingleFlight, _scrape_shared
+
+URL = "https://example.com/vehiculo"
+
+
+class SlowScraper:
+    """Scraper de prueba: tarda `delay` segundos y anota el plazo que ve la descarga."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.calls = 0
+        self.budgets = []
+
+    async def scrape_async(self, url, *args):
+        self.calls += 1
+        self.budgets.append(deadline.remaining())
+        await asyncio.sleep(self.delay)
+        return pd.DataFrame({"Key": ["k"], "Value": ["v"]})
+
+
+@pytest.fixture(autouse=True)
+def fresh_flights(monkeypatch):
+    monkeypatch.setattr(scraping_service, "scrape_flights", SingleFlight())
+
+
+async def _with_deadline(seconds, coro):
+    with deadline.deadline_scope(seconds):
+        return await coro
+
+
+def test_follower_keeps_its_own_budget():
+    # El primero tiene un plazo corto; el segundo, ninguno: solo el primero agota el plazo
+    scraper = SlowScraper(0.2)
+
+    async def main():
+        leader = asyncio.ensure_future(_with_deadline(0.05, _scrape_shared(scraper, URL)))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(_scrape_shared(scraper, URL))
+        return await asyncio.gather(leader, follower, return_exceptions=True)
+
+    leader, follower = asyncio.run(main())
+    assert isinstance(leader, DeadlineExceeded)
+    assert isinstance(follower, pd.DataFrame) and len(follower) == 1
+    assert scraper.calls == 1
+    assert scraper.budgets == [None]  # la descarga compartida no hereda el plazo del primero
+
+
+def test_expired_budget_fails_without_scraping():
+    scraper = SlowScraper(0)
+
+    async def main():
+        with deadline.deadline_scope(0):
+            await _scrape_shared(scraper, URL)
+
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(main())
+    assert scraper.calls == 0
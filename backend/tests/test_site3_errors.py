@@ -0,0 +1,40 @@
+# tests/test_site3_errors.py
+# Ejecutar desde backend/: python -m pytest tests
+
+import asyncio
+
+import pytest
+
+from app.scraping.errors import CircuitOpenError, FetchConnectionError, FetchHTTPError
+from app.scraping.scraping_site_3 import Site3Scraper
+from app.services.scraping_service import scrape_site
+
+URL = "https://example.com/vehiculo"
+
+
+def _scraper(error: Exception) -> Site3Scraper:
+    scraper = Site3Scraper()
+    scraper.result_cache = None
+
+    async def fail(url):
+        raise error
+
+    scraper.fetch_html_async = fail
+    return scraper
+
+
+@pytest.mark.parametrize("error, status", [
+    (CircuitOpenError(URL, 30), "unavailable"),
+    (FetchHTTPError(URL, 503), "error"),
+    (FetchConnectionError(URL, "conexión rechazada"), "error"),
+])
+def test_fetch_errors_are_reported(error, status):
+    result = asyncio.run(scrape_site(_scraper(error), URL))
+    assert result.status == status
+    assert result.df is None
+
+
+def test_other_errors_return_empty_frame():
+    result = asyncio.run(scrape_site(_scraper(ValueError("HTML inesperado")), URL))
+    assert result.status == "ok"
+    assert result.df.empty
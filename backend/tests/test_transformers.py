@@ -0,0 +1,84 @@
+# tests/test_transformers.py
+# Ejecutar desde backend/: python -m pytest tests
+#
+# Corpus congelado de los transformadores (tests/data/transformer_corpus.jsonl): una línea por caso
+# con el sitio, las filas scrapeadas (Key, Value) y la salida esperada de transform() o el tipo de
+# la excepción. Las salidas esperadas se generaron con los transformadores originales, anteriores a
+# VehicleRecord: solo deben regenerarse si un cambio de comportamiento es intencionado.
+# Las entradas son las páginas de ejemplo de cada sitio y variantes con valores alternativos,
+# filas repetidas o desordenadas y claves sobrantes.
+
+import json
+import math
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from app.services.transform_service import TRANSFORMERS
+
+CORPUS_PATH = Path(__file__).parent / "data" / "transformer_corpus.jsonl"
+with open(CORPUS_PATH, encoding="utf-8") as f:
+    CORPUS = [json.loads(line) for line in f]
+
+
+def _rows(keys, values):
+    """Filas comparables: (clave, tipo del valor, valor), con NaN igual a NaN."""
+    return [
+        (key, type(value).__name__, "NaN" if isinstance(value, float) and math.isnan(value) else value)
+        for key, value in zip(keys, values)
+    ]
+
+
+def _check_output(df: pd.DataFrame, case) -> None:
+    transformer = TRANSFORMERS[case["site"]]
+    assert list(df.columns) == ["Key", "Value"]
+    assert isinstance(df.index, pd.RangeIndex) and df.index.start == 0
+    assert df["Key"].dtype == pd.CategoricalDtype(transformer.config.ordered_keys, ordered=True)
+    expected = case["expected"]
+    assert _rows(df["Key"].astype(object), df["Value"]) == _rows(expected["Key"], expected["Value"])
+
+
+@pytest.mark.parametrize("case", CORPUS, ids=[f"{case['site']}-{case['name']}" for case in CORPUS])
+def test_transform_matches_corpus(case):
+    transformer = TRANSFORMERS[case["site"]]
+    df_input = pd.DataFrame(case["input"])
+    if "error" in case:
+        with pytest.raises(Exception) as excinfo:
+            transformer.transform(df_input)
+        assert type(excinfo.value).__name__ == case["error"]
+        return
+    _check_output(transformer.transform(df_input), case)
+
+
+@pytest.mark.parametrize("site", sorted(TRANSFORMERS))
+def test_transform_batch_matches_transform(site):
+    cases = [case for case in CORPUS if case["site"] == site]
+    long_df = pd.concat(
+        [pd.DataFrame(case["input"]).assign(vehicle_id=i) for i, case in enumerate(cases)],
+        ignore_index=True,
+    )
+    errors = {}
+    result = TRANSFORMERS[site].transform_batch(long_df, errors=errors)
+
+    # Vehículos en orden de aparición; los que fallan quedan fuera y en errors.
+    # Un vehículo sin filas no tiene ninguna en la tabla larga: no aparece.
+    present = [i for i, case in enumerate(cases) if case["input"]["Key"]]
+    assert list(dict.fromkeys(result["vehicle_id"])) == [i for i in present if "error" not in cases[i]]
+    assert {i: type(e).__name__ for i, e in errors.items()} == {
+        i: cases[i]["error"] for i in present if "error" in cases[i]
+    }
+    for i in present:
+        case = cases[i]
+        if "error" not in case:
+            vehicle = result[result["vehicle_id"] == i].drop(columns="vehicle_id").reset_index(drop=True)
+            _check_output(vehicle, case)
+
+
+def test_transform_batch_raises_without_errors_dict():
+    cases = [case for case in CORPUS if case["site"] == "site2"]
+    failing = next(case for case in cases if "error" in case)
+    long_df = pd.DataFrame(failing["input"]).assign(vehicle_id=0)
+    with pytest.raises(Exception) as excinfo:
+        TRANSFORMERS["site2"].transform_batch(long_df)
+    assert type(excinfo.value).__name__ == failing["error"]
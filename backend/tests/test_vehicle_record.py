@@ -0,0 +1,88 @@
+# tests/test_vehicle_record.py
+# Ejecutar desde backend/: python -m pytest tests
+
+import pandas as pd
+
+from app.data_transformation.vehicle_record import VehicleRecord
+
+
+def _record(*rows) -> VehicleRecord:
+    return VehicleRecord(rows)
+
+
+def test_preserves_order_and_duplicate_keys():
+    record = _record(("fuel", "Benzine"), ("make", "Peugeot"), ("fuel", "Elektriciteit"))
+    assert record.items() == [("fuel", "Benzine"), ("make", "Peugeot"), ("fuel", "Elektriciteit")]
+    assert len(record) == 3
+    assert list(record.keys()) == ["fuel", "make"]
+    assert record.first("fuel") == "Benzine"
+    assert record.values("fuel") == ["Benzine", "Elektriciteit"]
+    assert record.first("missing", "None") == "None"
+    assert record.values("missing") == []
+    assert "fuel" in record and "missing" not in record
+
+
+def test_frame_round_trip():
+    df = pd.DataFrame({"Key": ["a", "b", "a"], "Value": ["1", None, 3]})
+    record = VehicleRecord.from_frame(df)
+    assert record.to_frame().equals(df)
+    keys, values = record.columns()
+    assert keys == ["a", "b", "a"] and values == ["1", None, 3]
+
+
+def test_update_and_set_touch_every_row_with_the_key():
+    record = _record(("a", "1"), ("b", "2"), ("a", "3"))
+    record.update("a", lambda value: value + "0")
+    assert record.items() == [("a", "10"), ("b", "2"), ("a", "30")]
+    record.set("a", "x")
+    assert record.items() == [("a", "x"), ("b", "2"), ("a", "x")]
+    record.update("missing", lambda value: 1 / 0)  # sin filas: no se llama
+
+
+def test_append_after_existing_rows():
+    record = _record(("a", "1"))
+    record.append("b", "2")
+    record.append("a", "3")
+    assert record.values("a") == ["1", "3"]
+    assert record.items()[-1] == ("a", "3")
+
+
+def test_rename_keeps_rows_in_place():
+    record = _record(("a", "1"), ("b", "2"), ("a", "3"))
+    record.rename("a", "c")
+    assert record.items() == [("c", "1"), ("b", "2"), ("c", "3")]
+    assert "a" not in record
+    assert record.values("c") == ["1", "3"]
+    record.rename("missing", "z")
+    assert "z" not in record
+
+
+def test_rename_merges_positions_into_existing_key():
+    # Las filas quedan en el orden del registro, no "primero las de la clave destino"
+    record = _record(("a", "1"), ("b", "2"), ("a", "3"), ("b", "4"))
+    record.rename("b", "a")
+    assert record.items() == [("a", "1"), ("a", "2"), ("a", "3"), ("a", "4")]
+    assert record.values("a") == ["1", "2", "3", "4"]
+    assert record.first("a") == "1"
+    assert list(record.keys()) == ["a"]
+    record.set("a", "x")
+    assert record.values("a") == ["x"] * 4
+
+
+def test_remove_rebuilds_the_index():
+    record = _record(("a", "1"), ("b", "2"), ("c", "3"), ("a", "4"), ("d", "5"))
+    record.remove("a", "c")
+    assert record.items() == [("b", "2"), ("d", "5")]
+    assert "a" not in record and "c" not in record
+    # Las posiciones se recalculan: los accesos por clave apuntan a las filas correctas
+    assert record.first("d") == "5"
+    record.update("d", lambda value: value + "!")
+    record.append("b", "6")
+    assert record.items() == [("b", "2"), ("d", "5!"), ("b", "6")]
+    assert record.values("b") == ["2", "6"]
+
+
+def test_remove_missing_keys_is_a_no_op():
+    record = _record(("a", "1"), ("a", "2"))
+    record.remove("missing")
+    assert record.items() == [("a", "1"), ("a", "2")]